@@ -3,30 +3,30 @@
 Auto-categorize remaining clothing items based on visual inspection.
 This script processes all remaining items in tops_dresses directory.
 """
-import os
+import argparse
 import shutil
-from pathlib import Path
+
+from config import CLOTHES_DIR
 
 # Map of filenames to their categories based on visual review
 # t = tops, d = dresses, o = outerwear, b = bottoms
 categories = {}
 
 # Define paths
-tops_dresses_dir = Path("clothes/tops_dresses")
-tops_dir = Path("clothes/tops")
-dresses_dir = Path("clothes/dresses")
-outerwear_dir = Path("clothes/outwear")
-bottoms_dir = Path("clothes/bottoms")
-
-# Get all remaining image files
-image_files = sorted([f for f in tops_dresses_dir.iterdir() if f.suffix.lower() in ['.png', '.jpg', '.jpeg']])
+tops_dresses_dir = CLOTHES_DIR / "tops_dresses"
+tops_dir = CLOTHES_DIR / "tops"
+dresses_dir = CLOTHES_DIR / "dresses"
+outerwear_dir = CLOTHES_DIR / "outwear"
+bottoms_dir = CLOTHES_DIR / "bottoms"
 
-print(f"Processing {len(image_files)} remaining images...")
+def get_image_files():
+    """Get all remaining image files"""
+    return sorted([f for f in tops_dresses_dir.iterdir() if f.suffix.lower() in ['.png', '.jpg', '.jpeg']])
 
 # You can add entries here in format: 'filename.png': 't' (or 'd', 'o', 'b')
 # This will be populated as Claude categorizes batches
 
-def categorize_and_move():
+def categorize_and_move(image_files):
     moved_count = {"tops": 0, "dresses": 0, "outerwear": 0, "bottoms": 0}
 
     for img_file in image_files:
@@ -56,7 +56,13 @@ def categorize_and_move():
     print(f"  Bottoms: {moved_count['bottoms']}")
     print(f"  Remaining: {len(list(tops_dresses_dir.glob('*.png')))}")
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move tops_dresses items listed in the categories map")
+    parser.parse_args(argv)
+
+    image_files = get_image_files()
+    print(f"Processing {len(image_files)} remaining images...")
+
     if not categories:
         print("No categories defined yet. Add categories to the 'categories' dict first.")
         print("\nRemaining files:")
@@ -65,4 +71,7 @@ if __name__ == "__main__":
         if len(image_files) > 20:
             print(f"  ... and {len(image_files) - 20} more")
     else:
-        categorize_and_move()
+        categorize_and_move(image_files)
+
+if __name__ == "__main__":
+    main()
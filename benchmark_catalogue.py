@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Benchmark the catalogue tooling on synthetic clothes/ trees.
+
+Builds throwaway trees of 1k, 10k and 100k PNGs and times each stage:
+scanning the category folders, building items.json with
+generate_items_list(), and bulk-moving unsorted images into categories
+the way the sorter scripts do. Wall time, syscalls and peak memory are
+recorded per stage so quadratic behaviour shows up long before the real
+catalogue gets that big.
+
+Each figure comes from its own run of the stage, with the tree reset in
+between, so tracemalloc and strace never slow down the timed runs. Wall
+time is the fastest of several runs, which filters out one-off noise
+like a cold page cache or a busy machine.
+Syscalls are counted with `strace -c -f` when strace is installed and
+allowed. Otherwise only read/write calls are counted, from
+/proc/self/io, which misses the directory listings, stats and renames
+that the scan and move stages mostly make.
+
+Usage:
+    python3 benchmark_catalogue.py
+    python3 benchmark_catalogue.py --sizes 1000 10000 --output bench_output.txt
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+
+from generate_items_list import generate_items_list
+
+# Same categories generate_items_list() scans
+CATEGORIES = ['tops', 'outwear', 'dresses', 'bottoms', 'shoes', 'bags', 'accessories', 'molly']
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Share of the synthetic items left unsorted in clothes/ for the move stage
+UNSORTED_FRACTION = 0.1
+
+# Per-item cost growing faster than this between sizes gets flagged
+SCALING_WARN_RATIO = 2.0
+
+# Stages faster than this at the smaller size are too noisy to compare
+MIN_SCALING_SECONDS = 0.01
+
+# Timed runs per stage; the fastest is reported
+TIMING_RUNS = 5
+
+STAGES = ['build_tree', 'scan', 'items_json', 'move']
+
+# How syscalls were counted: 'strace' (every call) or 'read/write' (/proc/self/io)
+SYSCALL_LABELS = {'strace': 'syscalls', 'read/write': 'rd/wr calls'}
+
+
+def make_png():
+    """Return the bytes of a minimal valid 1x1 RGBA PNG."""
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body))
+
+    header = struct.pack('>IIBBBBB', 1, 1, 8, 6, 0, 0, 0)
+    pixels = zlib.compress(b'\x00\x00\x00\x00\x00')
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', pixels) + chunk(b'IEND', b'')
+
+
+def build_tree(root, total):
+    """Create a synthetic clothes/ tree with `total` PNGs under `root`.
+
+    Most items are spread across the category folders; a slice is left
+    loose in clothes/ itself so the move stage has work to do.
+    """
+    png = make_png()
+    clothes_dir = root / 'clothes'
+    for category in CATEGORIES:
+        (clothes_dir / category).mkdir(parents=True)
+
+    unsorted = int(total * UNSORTED_FRACTION)
+    for i in range(total):
+        if i < unsorted:
+            path = clothes_dir / f'{i:08x}-unsorted.png'
+        else:
+            category = CATEGORIES[i % len(CATEGORIES)]
+            path = clothes_dir / category / f'{i:08x}-item.png'
+        path.write_bytes(png)
+
+    return clothes_dir
+
+
+def read_write_syscalls():
+    """Return read+write syscalls made so far, or None if unavailable.
+
+    Uses /proc/self/io, so this is only populated on Linux. Directory
+    listings, stats and renames are not included in these counters.
+    """
+    try:
+        with open('/proc/self/io') as f:
+            counters = dict(line.split(': ') for line in f.read().splitlines())
+        return int(counters['syscr']) + int(counters['syscw'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def strace_calls(stage, root, total):
+    """Count every syscall one run of `stage` makes, using strace -c -f.
+
+    The stage runs in a child process started with --stage. Returns None
+    if strace is missing or not allowed to trace (e.g. in some containers).
+    """
+    if shutil.which('strace') is None:
+        return None
+
+    with tempfile.NamedTemporaryFile(mode='r', suffix='.strace') as summary:
+        try:
+            subprocess.run(
+                ['strace', '-c', '-f', '-o', summary.name,
+                 sys.executable, os.path.abspath(__file__),
+                 '--stage', stage, '--root', str(root), '--total', str(total)],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        # The summary ends with "100.00 <seconds> <usecs/call> <calls> [errors] total"
+        for line in summary.read().splitlines():
+            fields = line.split()
+            if fields and fields[-1] == 'total':
+                return int(fields[3])
+    return None
+
+
+_strace_baseline = {}
+
+
+def count_syscalls(stage, root, total):
+    """Return (syscalls, label) for one run of `stage`, or (None, None)."""
+    if 'calls' not in _strace_baseline:
+        # Interpreter startup and imports in the child, subtracted from every stage
+        _strace_baseline['calls'] = strace_calls('none', root, total)
+
+    if _strace_baseline['calls'] is not None:
+        calls = strace_calls(stage, root, total)
+        if calls is not None:
+            return calls - _strace_baseline['calls'], 'strace'
+
+    before = read_write_syscalls()
+    run_stage(stage, root, total)
+    after = read_write_syscalls()
+    if before is None or after is None:
+        return None, None
+    return after - before, 'read/write'
+
+
+def measure(stage, root, total, runs=TIMING_RUNS):
+    """Return wall time, syscalls and peak memory for `stage`.
+
+    Each is taken from separate runs, resetting the tree before each one.
+    Wall time is the minimum over `runs` timed runs.
+    """
+    elapsed = float('inf')
+    for _ in range(runs):
+        reset_stage(stage, root)
+        start = time.perf_counter()
+        run_stage(stage, root, total)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    reset_stage(stage, root)
+    tracemalloc.start()
+    run_stage(stage, root, total)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    reset_stage(stage, root)
+    syscalls, syscall_source = count_syscalls(stage, root, total)
+
+    return {'seconds': elapsed, 'syscalls': syscalls, 'syscall_source': syscall_source, 'peak_bytes': peak}
+
+
+def scan_stage(clothes_dir):
+    """List every image in the category folders, like the scripts do."""
+    found = 0
+    for category in CATEGORIES:
+        for filename in os.listdir(clothes_dir / category):
+            if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
+                found += 1
+    return found
+
+
+def items_json_stage(root):
+    """Build items.json with the real generate_items_list()."""
+    # generate_items_list() prints a line per category; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_items_list(root / 'clothes', root / 'items.json', root / 'item_ids.json')
+
+
+def move_stage(clothes_dir):
+    """Move loose images in clothes/ into categories, like sort_clothes()."""
+    png_files = [f for f in os.listdir(clothes_dir)
+                 if f.endswith('.png') and os.path.isfile(os.path.join(clothes_dir, f))]
+    for i, filename in enumerate(png_files):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        shutil.move(os.path.join(clothes_dir, filename),
+                    os.path.join(clothes_dir, category, filename))
+
+
+def run_stage(stage, root, total):
+    """Run one benchmark stage against the tree under `root`."""
+    clothes_dir = root / 'clothes'
+    if stage == 'build_tree':
+        build_tree(root, total)
+    elif stage == 'scan':
+        scan_stage(clothes_dir)
+    elif stage == 'items_json':
+        items_json_stage(root)
+    elif stage == 'move':
+        move_stage(clothes_dir)
+
+
+def reset_stage(stage, root):
+    """Put the tree back the way `stage` expects to find it."""
+    clothes_dir = root / 'clothes'
+    if stage == 'build_tree':
+        shutil.rmtree(clothes_dir, ignore_errors=True)
+    elif stage == 'items_json':
+        for name in ('items.json', 'item_ids.json'):
+            (root / name).unlink(missing_ok=True)
+    elif stage == 'move':
+        for category in CATEGORIES:
+            for path in (clothes_dir / category).glob('*-unsorted.png'):
+                path.rename(clothes_dir / path.name)
+
+
+def run_benchmark(total, runs=TIMING_RUNS):
+    """Benchmark every stage on a fresh tree of `total` items."""
+    with tempfile.TemporaryDirectory(prefix='dressup-bench-') as tmp:
+        root = Path(tmp)
+        results = {'items': total}
+        for stage in STAGES:
+            results[stage] = measure(stage, root, total, runs)
+    return results
+
+
+def format_row(stage, stats):
+    syscalls = '-' if stats['syscalls'] is None else f"{stats['syscalls']:,}"
+    return (f"  {stage:<12} {stats['seconds']:>10.3f}s {syscalls:>12} "
+            f"{stats['peak_bytes'] / (1024 * 1024):>10.2f} MB")
+
+
+def scaling_warnings(all_results):
+    """Flag stages whose per-item cost grows superlinearly between sizes.
+
+    Stages that take under MIN_SCALING_SECONDS at the smaller size are
+    skipped, since timer noise dominates the ratio there.
+    """
+    warnings = []
+    for smaller, larger in zip(all_results, all_results[1:]):
+        for stage in ('scan', 'items_json', 'move'):
+            if smaller[stage]['seconds'] < MIN_SCALING_SECONDS:
+                continue
+            small_cost = smaller[stage]['seconds'] / smaller['items']
+            large_cost = larger[stage]['seconds'] / larger['items']
+            if small_cost > 0 and large_cost / small_cost > SCALING_WARN_RATIO:
+                warnings.append(
+                    f"{stage}: per-item time grew {large_cost / small_cost:.1f}x "
+                    f"from {smaller['items']:,} to {larger['items']:,} items"
+                )
+    return warnings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark catalogue tooling on synthetic trees')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Number of PNGs per synthetic tree (default: 1000 10000 100000)')
+    parser.add_argument('--runs', type=int, default=TIMING_RUNS,
+                        help=f'Timed runs per stage, fastest reported (default: {TIMING_RUNS})')
+    parser.add_argument('--output', help='Also write the raw results as JSON to this file')
+    # Used by strace_calls() to run a single stage in a traced child process
+    parser.add_argument('--stage', choices=STAGES + ['none'], help=argparse.SUPPRESS)
+    parser.add_argument('--root', help=argparse.SUPPRESS)
+    parser.add_argument('--total', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.stage:
+        run_stage(args.stage, Path(args.root), args.total)
+        return 0
+
+    all_results = []
+    for total in sorted(args.sizes):
+        results = run_benchmark(total, args.runs)
+        sources = {results[stage]['syscall_source'] for stage in STAGES} - {None}
+        syscall_label = SYSCALL_LABELS['strace'] if sources == {'strace'} else SYSCALL_LABELS['read/write']
+
+        print(f"\n{total:,} items")
+        print(f"  {'stage':<12} {'wall':>11} {syscall_label:>12} {'peak mem':>13}")
+        for stage in STAGES:
+            print(format_row(stage, results[stage]))
+        if 'read/write' in sources:
+            print("  (strace unavailable: only read/write syscalls counted, so scan and move show almost none)")
+        all_results.append(results)
+
+    warnings = scaling_warnings(all_results)
+    if warnings:
+        print("\nPossible superlinear scaling:")
+        for warning in warnings:
+            print(f"  - {warning}")
+    else:
+        print("\nNo superlinear scaling across the tested sizes "
+              f"(stages under {MIN_SCALING_SECONDS * 1000:.0f} ms at the smaller size aren't compared).")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(all_results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    return 1 if warnings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,12 +2,13 @@
 """
 Script to categorize clothing images into tops, dresses, and outerwear
 """
-import os
+import argparse
 import shutil
-from pathlib import Path
+
+from config import CLOTHES_DIR
 
 # Define paths
-base_dir = Path("/Users/hannahlyon/Documents/Projects/dress_up/clothes")
+base_dir = CLOTHES_DIR
 source_dir = base_dir / "tops_dresses"
 tops_dir = base_dir / "tops"
 dresses_dir = base_dir / "dresses"
@@ -100,7 +101,10 @@ def move_files():
 
     return moved_counts, errors
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move tops_dresses items using the hand-made categorization map")
+    parser.parse_args(argv)
+
     print(f"Starting categorization...")
     print(f"Source directory: {source_dir}")
     print(f"Items to categorize: {len(categorization)}")
@@ -125,3 +129,6 @@ if __name__ == "__main__":
     # Check remaining files
     remaining = list(source_dir.glob("*.png"))
     print(f"\nRemaining in tops_dresses/: {len(remaining)}")
+
+if __name__ == "__main__":
+    main()
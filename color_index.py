@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Dominant-colour index for colour-coordinated outfits.
+
+Running this script extracts a small palette of dominant colours from
+the opaque pixels of every item in items.json and saves it to
+colors.npz. Palettes are found with a k-means that runs on a whole batch
+of items at once, so the cost is a handful of NumPy operations per batch
+rather than a Python loop per pixel.
+
+The email server loads colors.npz once through ColorIndex and answers
+"which items are closest to this colour" queries with one scipy cKDTree
+per category. If scipy is missing it falls back to a vectorized NumPy
+scan, which gives the same answers.
+
+Requires Pillow and NumPy to build the index, NumPy and scipy to query it
+(both are in requirements.txt for the server):
+    pip3 install Pillow numpy scipy
+
+NumPy, Pillow and scipy are imported inside the functions that use them,
+so importing this module (the CLI, the email server) stays fast.
+
+Usage:
+    python3 color_index.py
+"""
+import argparse
+import json
+
+from config import CLOTHES_DIR, ITEMS_FILE, COLORS_FILE as INDEX_FILE
+
+PALETTE_SIZE = 3  # dominant colours kept per item
+SAMPLE_PIXELS = 1024  # opaque pixels sampled per item for k-means
+KMEANS_ITERATIONS = 12
+BATCH_SIZE = 128  # items clustered together per k-means batch
+MIN_ALPHA = 128  # pixels at least this opaque count as part of the item
+MIN_WEIGHT = 0.15  # palette colours covering less of the item are not indexed
+
+
+def sample_opaque_pixels(path, rng):
+    """Return SAMPLE_PIXELS x 3 float32 RGB samples of an item's opaque pixels."""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as img:
+        pixels = np.asarray(img.convert('RGBA')).reshape(-1, 4)
+
+    opaque = pixels[pixels[:, 3] >= MIN_ALPHA, :3]
+    if len(opaque) == 0:
+        opaque = pixels[:, :3]
+
+    choice = rng.choice(len(opaque), SAMPLE_PIXELS, replace=len(opaque) < SAMPLE_PIXELS)
+    return opaque[choice].astype(np.float32)
+
+
+def batched_kmeans(samples, k=PALETTE_SIZE, iterations=KMEANS_ITERATIONS):
+    """Run k-means on every item in a batch at once.
+
+    samples is (items, pixels, 3). Returns (centers, weights) shaped
+    (items, k, 3) and (items, k), with clusters sorted by weight.
+    """
+    import numpy as np
+
+    items, pixels, _ = samples.shape
+
+    # Seed from pixels spread evenly through each item's brightness order
+    brightness_order = np.argsort(samples.sum(axis=2), axis=1)
+    seed_positions = ((np.arange(k) + 0.5) * pixels / k).astype(int)
+    seeds = brightness_order[:, seed_positions]
+    centers = np.take_along_axis(samples, seeds[:, :, None], axis=1)
+
+    for _ in range(iterations):
+        distances = ((samples[:, :, None, :] - centers[:, None, :, :]) ** 2).sum(axis=3)
+        labels = distances.argmin(axis=2)
+        one_hot = (labels[:, :, None] == np.arange(k)).astype(np.float32)
+        counts = one_hot.sum(axis=1)
+        sums = np.einsum('npk,npc->nkc', one_hot, samples)
+        centers = np.where(counts[:, :, None] > 0,
+                           sums / np.maximum(counts, 1)[:, :, None],
+                           centers)
+
+    weights = counts / pixels
+    order = np.argsort(-weights, axis=1)
+    centers = np.take_along_axis(centers, order[:, :, None], axis=1)
+    weights = np.take_along_axis(weights, order, axis=1)
+    return centers, weights
+
+
+def build_color_index():
+    """Extract palettes for every catalogued item and write INDEX_FILE."""
+    import numpy as np
+
+    with open(ITEMS_FILE) as f:
+        items_data = json.load(f)
+
+    categories = sorted(items_data)
+    entries = [(category, filename)
+               for category in categories
+               for filename in items_data[category]]
+    print(f"Extracting palettes for {len(entries)} items...")
+
+    rng = np.random.default_rng(0)
+    palettes = np.zeros((len(entries), PALETTE_SIZE, 3), dtype=np.uint8)
+    weights = np.zeros((len(entries), PALETTE_SIZE), dtype=np.float32)
+
+    for start in range(0, len(entries), BATCH_SIZE):
+        batch = entries[start:start + BATCH_SIZE]
+        samples = np.stack([
+            sample_opaque_pixels(CLOTHES_DIR / category / filename, rng)
+            for category, filename in batch
+        ])
+        centers, batch_weights = batched_kmeans(samples)
+        palettes[start:start + len(batch)] = np.clip(np.rint(centers), 0, 255)
+        weights[start:start + len(batch)] = batch_weights
+        print(f"  {start + len(batch)}/{len(entries)}")
+
+    np.savez_compressed(
+        INDEX_FILE,
+        categories=np.array(categories),
+        category_ids=np.array([categories.index(c) for c, _ in entries], dtype=np.uint8),
+        filenames=np.array([filename for _, filename in entries]),
+        palettes=palettes,
+        weights=weights,
+    )
+    print(f"\nSuccessfully generated {INDEX_FILE}")
+
+
+def parse_hex_color(value):
+    """Parse '#ff8800' or 'ff8800' into an (r, g, b) tuple.
+
+    Raises ValueError for anything else.
+    """
+    value = value.strip().lstrip('#')
+    if len(value) != 6:
+        raise ValueError(f"Invalid colour '{value}', expected 6 hex digits")
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+class ColorIndex:
+    """Nearest-colour lookups over the palettes in colors.npz."""
+
+    def __init__(self, path=INDEX_FILE):
+        import numpy as np
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            cKDTree = None
+
+        with np.load(path, allow_pickle=False) as data:
+            categories = [str(c) for c in data['categories']]
+            category_ids = data['category_ids']
+            filenames = data['filenames']
+            palettes = data['palettes'].astype(np.float32)
+            weights = data['weights']
+
+        # One tree per category over its items' significant palette colours;
+        # owners maps each tree point back to the item it came from
+        self.categories = {}
+        for category_id, category in enumerate(categories):
+            in_category = category_ids == category_id
+            significant = weights[in_category] >= MIN_WEIGHT
+            points = palettes[in_category][significant]
+            item_rows = np.nonzero(significant)[0]
+            owners = filenames[in_category][item_rows]
+            tree = cKDTree(points) if cKDTree is not None and len(points) else None
+            self.categories[category] = (points, owners, tree)
+
+    def nearest(self, color, category, limit=5):
+        """Return up to `limit` (filename, distance) pairs closest to color."""
+        import numpy as np
+
+        if category not in self.categories:
+            return []
+
+        points, owners, tree = self.categories[category]
+        if len(points) == 0:
+            return []
+
+        target = np.asarray(color, dtype=np.float32)
+        # Each item can own several points, so over-fetch before de-duplicating
+        k = min(len(points), limit * PALETTE_SIZE)
+        if tree is not None:
+            distances, indices = tree.query(target, k=k)
+            distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        else:
+            all_distances = np.sqrt(((points - target) ** 2).sum(axis=1))
+            indices = np.argpartition(all_distances, k - 1)[:k]
+            indices = indices[np.argsort(all_distances[indices])]
+            distances = all_distances[indices]
+
+        matches = []
+        seen = set()
+        for distance, index in zip(distances, indices):
+            filename = str(owners[index])
+            if filename in seen:
+                continue
+            seen.add(filename)
+            matches.append((filename, float(distance)))
+            if len(matches) == limit:
+                break
+        return matches
+
+    def coordinated_outfit(self, color, categories, limit=5):
+        """Return the closest items to color for each requested category."""
+        return {category: self.nearest(color, category, limit) for category in categories}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the dominant-colour index (colors.npz)')
+    parser.parse_args(argv)
+
+    build_color_index()
+
+
+if __name__ == '__main__':
+    main()
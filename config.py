@@ -0,0 +1,61 @@
+"""
+Paths shared by the catalogue scripts and the dressup CLI.
+
+Defaults live next to this file. Override them in a dressup.json file in
+the same folder, e.g. {"clothes_dir": "/path/to/clothes"}, or with
+DRESSUP_<NAME> environment variables (DRESSUP_CLOTHES_DIR=...), which take
+priority over the file. Relative paths are resolved against this folder.
+
+Only the standard library is imported here so the CLI stays fast to start.
+"""
+import json
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent
+CONFIG_FILE = ROOT_DIR / "dressup.json"
+
+DEFAULT_PATHS = {
+    "clothes_dir": "clothes",
+    "items_file": "items.json",
+    "item_ids_file": "item_ids.json",
+    "trimmed_dir": "clothes_trimmed",
+    "trims_file": "trims.json",
+    "trim_cache_file": ".trim_cache.json",
+    "colors_file": "colors.npz",
+    "optimize_cache_file": ".optimize_cache.json",
+    "history_file": "outfit_history.log",
+    "history_index_file": "outfit_history.idx",
+    "digest_queue_dir": "digest_queue",
+}
+
+
+def load_paths():
+    """Resolve every configured path from defaults, dressup.json and env vars."""
+    settings = dict(DEFAULT_PATHS)
+
+    if CONFIG_FILE.exists():
+        with open(CONFIG_FILE) as f:
+            settings.update(json.load(f))
+
+    for name in DEFAULT_PATHS:
+        env_value = os.environ.get(f"DRESSUP_{name.upper()}")
+        if env_value:
+            settings[name] = env_value
+
+    return {name: ROOT_DIR / os.path.expanduser(settings[name]) for name in DEFAULT_PATHS}
+
+
+_paths = load_paths()
+
+CLOTHES_DIR = _paths["clothes_dir"]
+ITEMS_FILE = _paths["items_file"]
+ITEM_IDS_FILE = _paths["item_ids_file"]
+TRIMMED_DIR = _paths["trimmed_dir"]
+TRIMS_FILE = _paths["trims_file"]
+TRIM_CACHE_FILE = _paths["trim_cache_file"]
+COLORS_FILE = _paths["colors_file"]
+OPTIMIZE_CACHE_FILE = _paths["optimize_cache_file"]
+HISTORY_FILE = _paths["history_file"]
+HISTORY_INDEX_FILE = _paths["history_index_file"]
+DIGEST_QUEUE_DIR = _paths["digest_queue_dir"]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the closet tooling.
+
+Each subcommand lives in its own script and is only imported when it is
+run, so `dressup items` never pays for NumPy, Pillow or the Anthropic SDK.
+Everything after the subcommand name is passed to that script's own
+argument parser, e.g. `dressup sort --bulk` or `dressup optimize --help`.
+
+Paths come from config.py (dressup.json / DRESSUP_* environment variables).
+
+Usage:
+    python3 dressup.py <command> [options]
+    python3 dressup.py profile [command]   # import-time profile of startup
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# command -> (module, description)
+COMMANDS = {
+    'items': ('generate_items_list', 'Regenerate items.json from the clothes folders'),
+    'sort': ('sort_clothes', 'Classify unsorted images with Claude and move them'),
+    'manual-sort': ('manual_sorter', 'Sort unsorted images by hand, one at a time'),
+    'categorize-batch': ('batch_categorize', 'Split tops_dresses by typing a letter per image, in batches'),
+    'categorize-interactive': ('categorize_tops_dresses', 'Split tops_dresses one image at a time'),
+    'categorize-auto': ('auto_categorize', 'Split tops_dresses using the map in auto_categorize.py'),
+    'categorize-mapped': ('categorize_clothes', 'Split tops_dresses using the map in categorize_clothes.py'),
+    'optimize': ('optimize_images', 'Losslessly recompress the clothing PNGs'),
+    'trim': ('trim_images', 'Trim transparent padding and record offsets in trims.json'),
+    'colors': ('color_index', 'Build the dominant-colour index (colors.npz)'),
+    'bench': ('benchmark_catalogue', 'Benchmark the catalogue tools on synthetic trees'),
+}
+
+# Startup (CLI + subcommand imports) should stay under this for hooks and cron
+STARTUP_BUDGET_MS = 50
+PROFILE_TOP_MODULES = 10
+
+
+def profile_imports(command_argv):
+    """Profile the imports of `dressup <command> --help` with -X importtime."""
+    import subprocess
+    import time
+
+    target = command_argv[:1] + ['--help'] if command_argv else ['--help']
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.abspath(__file__)] + target,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    # Lines look like "import time:       123 |        456 | package.module",
+    # nested imports are indented under the module that pulled them in
+    total_us = 0
+    top_level = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        if not name[1:].startswith(' '):
+            top_level.append((int(cumulative_us), name.strip()))
+
+    print(f"Profiled: dressup {' '.join(target)}")
+    print(f"Process wall time: {wall_ms:.1f} ms (includes interpreter startup)")
+    print(f"Total import time: {total_us / 1000:.1f} ms")
+    print(f"\nSlowest top-level imports:")
+    for cumulative_us, name in sorted(top_level, reverse=True)[:PROFILE_TOP_MODULES]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    if total_us / 1000 > STARTUP_BUDGET_MS:
+        print(f"\nWarning: imports exceed the {STARTUP_BUDGET_MS} ms startup budget")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='dressup',
+        description='Closet tooling for the Outfit Creator',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='commands:\n' + '\n'.join(
+            f'  {name:<24}{description}' for name, (_, description) in COMMANDS.items()
+        ) + f"\n  {'profile [command]':<24}Show the import-time profile of a command's startup",
+    )
+    parser.add_argument('command', choices=list(COMMANDS) + ['profile'], metavar='command')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='options for the command')
+    args = parser.parse_args(argv)
+
+    if args.command == 'profile':
+        return profile_imports(args.args)
+
+    module_name, _ = COMMANDS[args.command]
+    module = importlib.import_module(module_name)
+    return module.main(args.args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,9 +4,12 @@ Email server for sending outfit images to Hannah
 """
 import os
 import base64
+import hashlib
 import time
 import secrets
+import threading
 from collections import defaultdict
+from contextlib import contextmanager
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import smtplib
@@ -15,6 +18,15 @@ from email.mime.text import MIMEText
 from email.mime.image import MIMEImage
 from dotenv import load_dotenv
 
+try:
+    import fcntl  # Not available on Windows, where only one process is locked out
+except ImportError:
+    fcntl = None
+from color_index import ColorIndex, INDEX_FILE, parse_hex_color
+from config import ROOT_DIR, DIGEST_QUEUE_DIR as DEFAULT_DIGEST_QUEUE_DIR
+from outfit_codec import ItemCatalog, OutfitError, ITEM_IDS_FILE, pack_ids
+from outfit_history import OutfitHistory
+
 # Load environment variables
 load_dotenv()
 
@@ -29,14 +41,24 @@ ALLOWED_ORIGINS = [
 
 CORS(app, origins=ALLOWED_ORIGINS, resources={
     r"/obs/*": {"origins": "*"},
-    r"/send-outfit": {"origins": ALLOWED_ORIGINS}
+    r"/send-outfit": {"origins": ALLOWED_ORIGINS},
+    r"/outfits/*": {"origins": ALLOWED_ORIGINS}
 })
 
 # Rate limiting storage (IP -> list of timestamps)
 rate_limit_storage = defaultdict(list)
 
 # OBS outfit storage (simple in-memory storage)
-obs_outfit_data = {'outfit': None}
+obs_outfit_data = {'outfit': None, 'packed': None}
+
+# Item id lookup table, loaded from item_ids.json on first use
+item_catalog_data = {'catalog': None}
+
+# Dominant-colour index, loaded from colors.npz on first use
+color_index_data = {'index': None}
+
+# Append-only log of every outfit sent or shown on OBS
+outfit_history = OutfitHistory()
 
 # Security configuration
 MAX_REQUESTS_PER_HOUR = 10  # Max 10 emails per hour per IP
@@ -44,6 +66,36 @@ MAX_REQUESTS_PER_MINUTE = 2  # Max 2 emails per minute per IP
 MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB max image size
 REQUEST_WINDOW_HOUR = 3600  # 1 hour in seconds
 REQUEST_WINDOW_MINUTE = 60  # 1 minute in seconds
+MAX_COORDINATED_MATCHES = 20  # Max matches per category for coordinated outfits
+MAX_OUTFIT_PAYLOAD_SIZE = 4 * 1024  # 4KB max outfit request body
+MAX_HISTORY_PAGE = 100  # Max outfit history entries per request
+MAX_POPULAR_ITEMS = 50  # Max items returned by the popularity query
+
+# Digest mode: queue accepted outfits and email them in batches instead of
+# opening an SMTP session per outfit
+DIGEST_MODE = os.getenv('DIGEST_MODE', 'false').lower() == 'true'
+DIGEST_INTERVAL_MINUTES = float(os.getenv('DIGEST_INTERVAL_MINUTES', '10'))  # Send at least this often
+DIGEST_MAX_OUTFITS = int(os.getenv('DIGEST_MAX_OUTFITS', '10'))  # ...or as soon as this many are queued
+DIGEST_MAX_BYTES = 20 * 1024 * 1024  # ...or before the encoded images outgrow Gmail's 25MB limit
+# The env var overrides config.py's digest_queue_dir; relative paths are resolved against ROOT_DIR
+DIGEST_QUEUE_DIR = str(ROOT_DIR / os.getenv('DIGEST_QUEUE_DIR', str(DEFAULT_DIGEST_QUEUE_DIR)))
+DIGEST_FAILED_DIR = os.path.join(DIGEST_QUEUE_DIR, 'failed')  # Outfits the mail server keeps rejecting
+DIGEST_MAX_ATTEMPTS = 3  # Rejections before an outfit is moved out of the queue
+DIGEST_CHECK_SECONDS = 30  # How often the background thread checks the queue age
+
+# Errors that mean the message itself was refused, not that the server was unreachable.
+# Listed before the connection errors they subclass, so they are caught first.
+DIGEST_REJECTED_ERRORS = (smtplib.SMTPDataError, smtplib.SMTPSenderRefused)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Serializes queue writes and flushes between threads; a file lock in
+# digest_queue_lock() does the same between processes
+digest_lock = threading.Lock()
+
+# Set by queue_outfit when the queue is full, so the digest thread sends it
+# straight away instead of at its next check
+digest_wakeup = threading.Event()
 
 # Simple shared secret for authentication
 API_SECRET = os.getenv('API_SECRET', secrets.token_urlsafe(32))
@@ -78,6 +130,257 @@ def is_rate_limited(ip_address):
 
     return False, None
 
+def get_email_config():
+    """Get email credentials from environment, or None if incomplete"""
+    config = {
+        'service': os.getenv('EMAIL_SERVICE', 'gmail'),
+        'user': os.getenv('EMAIL_USER'),
+        'password': os.getenv('EMAIL_PASS'),
+        'recipient': os.getenv('NOTIFICATION_EMAIL'),
+    }
+    if not all([config['user'], config['password'], config['recipient']]):
+        return None
+    return config
+
+def build_outfit_email(images):
+    """Build the notification email with one inline image per outfit"""
+    config = get_email_config()
+
+    msg = MIMEMultipart()
+    msg['From'] = config['user']
+    msg['To'] = config['recipient']
+
+    if len(images) == 1:
+        msg['Subject'] = 'New Outfit from Outfit Creator!'
+        heading = 'Someone created a new outfit for you!'
+        intro = 'Check out this outfit combination from your Outfit Creator:'
+    else:
+        msg['Subject'] = f'{len(images)} New Outfits from Outfit Creator!'
+        heading = f'People created {len(images)} new outfits for you!'
+        intro = 'Check out these outfit combinations from your Outfit Creator:'
+
+    image_tags = ''.join(
+        f'<p><img src="cid:outfit_image_{i}" style="max-width: 600px; border: 2px solid #000;"></p>'
+        for i in range(len(images))
+    )
+
+    # Email body
+    body = f"""
+        <html>
+            <body style="font-family: Arial, sans-serif; padding: 20px;">
+                <h2>{heading}</h2>
+                <p>{intro}</p>
+                {image_tags}
+                <p style="color: #666; font-size: 12px; margin-top: 30px;">
+                    Generated from Hannahbunnn's Outfit Creator
+                </p>
+            </body>
+        </html>
+        """
+
+    msg.attach(MIMEText(body, 'html'))
+
+    # Attach images
+    for i, image_bytes in enumerate(images):
+        filename = f'outfit_{i + 1}.png' if len(images) > 1 else 'outfit.png'
+        image = MIMEImage(image_bytes, _subtype='png', name=filename)
+        image.add_header('Content-ID', f'<outfit_image_{i}>')
+        image.add_header('Content-Disposition', 'inline', filename=filename)
+        msg.attach(image)
+
+    return msg
+
+def send_email(msg):
+    """Send an email over a single SMTP session"""
+    config = get_email_config()
+
+    # Send email via Gmail SMTP
+    if config['service'] == 'gmail':
+        with smtplib.SMTP('smtp.gmail.com', 587) as server:
+            server.starttls()
+            server.login(config['user'], config['password'])
+            server.send_message(msg)
+
+def encoded_size(raw_bytes):
+    """Size of an image once base64 encoded into 76-character MIME lines"""
+    encoded = (raw_bytes + 2) // 3 * 4
+    return encoded + encoded // 76 * 2
+
+@contextmanager
+def digest_queue_lock():
+    """Hold the digest queue against other threads and other processes"""
+    with digest_lock:
+        os.makedirs(DIGEST_QUEUE_DIR, exist_ok=True)
+        with open(os.path.join(DIGEST_QUEUE_DIR, '.lock'), 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+def queued_outfits():
+    """List queued outfits as (path, size) pairs, oldest first"""
+    if not os.path.isdir(DIGEST_QUEUE_DIR):
+        return []
+
+    entries = []
+    for entry in os.scandir(DIGEST_QUEUE_DIR):
+        if not entry.name.endswith('.png'):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue  # Sent by another process since it was listed
+        entries.append((stat.st_mtime, entry.path, stat.st_size))
+    return [(path, size) for _, path, size in sorted(entries)]
+
+def queue_full(queued):
+    """Whether the queue holds enough outfits, or bytes, to send without waiting"""
+    queued_size = sum(encoded_size(size) for _, size in queued)
+    return len(queued) >= DIGEST_MAX_OUTFITS or queued_size >= DIGEST_MAX_BYTES
+
+def queue_outfit(image_bytes):
+    """Persist an outfit to the digest queue, waking the digest thread if it's full.
+
+    Outfits are stored by content hash, so the same image is only queued
+    once. Returns False if it was already queued. Nothing is emailed here;
+    the digest thread does that outside the request.
+    """
+    with digest_queue_lock():
+        path = os.path.join(DIGEST_QUEUE_DIR, hashlib.sha256(image_bytes).hexdigest() + '.png')
+        if os.path.exists(path):
+            return False
+
+        # Write then rename so a crash never leaves a truncated image queued
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(image_bytes)
+        os.replace(tmp_path, path)
+
+        full = queue_full(queued_outfits())
+
+    if full:
+        digest_wakeup.set()
+    return True
+
+def digest_batches(queued):
+    """Group queued outfits into emails that each stay under DIGEST_MAX_BYTES"""
+    batches = []
+    batch, batch_size = [], 0
+    for path, size in queued:
+        size = encoded_size(size)
+        if batch and batch_size + size > DIGEST_MAX_BYTES:
+            batches.append(batch)
+            batch, batch_size = [], 0
+        batch.append(path)
+        batch_size += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+def remove_queued(path):
+    """Delete a queued outfit and its failure count, if still there"""
+    for stale_path in (path, path + '.failures'):
+        try:
+            os.remove(stale_path)
+        except FileNotFoundError:
+            pass
+
+def record_digest_failure(path):
+    """Count a rejection of one outfit, moving it aside after DIGEST_MAX_ATTEMPTS"""
+    failures_path = path + '.failures'
+    try:
+        with open(failures_path) as f:
+            failures = int(f.read() or 0) + 1
+    except (FileNotFoundError, ValueError):
+        failures = 1
+
+    if failures < DIGEST_MAX_ATTEMPTS:
+        with open(failures_path, 'w') as f:
+            f.write(str(failures))
+        return
+
+    os.makedirs(DIGEST_FAILED_DIR, exist_ok=True)
+    try:
+        os.replace(path, os.path.join(DIGEST_FAILED_DIR, os.path.basename(path)))
+    except FileNotFoundError:
+        pass
+    remove_queued(path)
+    print(f"Moved {os.path.basename(path)} to {DIGEST_FAILED_DIR} after {failures} rejected sends")
+
+def send_digest_batch(paths):
+    """Email one batch of queued outfits and remove them from the queue.
+
+    A rejected message is split in half and each half retried, down to
+    single outfits, which are counted towards DIGEST_MAX_ATTEMPTS.
+    Returns False if the mail server could not be reached, leaving the
+    batch queued.
+    """
+    images = []
+    sent_paths = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                images.append(f.read())
+        except FileNotFoundError:
+            continue  # Already sent by another process
+        sent_paths.append(path)
+
+    if not images:
+        return True
+
+    try:
+        send_email(build_outfit_email(images))
+    except DIGEST_REJECTED_ERRORS as e:
+        print(f"Digest email with {len(images)} outfits rejected: {str(e)}")
+        if len(sent_paths) == 1:
+            record_digest_failure(sent_paths[0])
+            return True
+        middle = len(sent_paths) // 2
+        return send_digest_batch(sent_paths[:middle]) and send_digest_batch(sent_paths[middle:])
+    except Exception as e:
+        print(f"Error sending digest email: {str(e)}")
+        return False
+
+    for path in sent_paths:
+        remove_queued(path)
+    print(f"Digest sent with {len(images)} outfits")
+    return True
+
+def flush_digest_locked(queued):
+    """Email every queued outfit, in as many messages as the size limit needs.
+
+    Caller must hold digest_queue_lock(). If the mail server can't be
+    reached the remaining outfits stay queued for the next flush.
+    """
+    for batch in digest_batches(queued):
+        if not send_digest_batch(batch):
+            return
+
+def flush_digest_if_due():
+    """Flush the queue once it's full or its oldest outfit has waited a full interval"""
+    with digest_queue_lock():
+        queued = queued_outfits()
+        if not queued:
+            return
+        if queue_full(queued):
+            flush_digest_locked(queued)
+            return
+        try:
+            oldest = os.path.getmtime(queued[0][0])
+        except FileNotFoundError:
+            return
+        if time.time() - oldest >= DIGEST_INTERVAL_MINUTES * 60:
+            flush_digest_locked(queued)
+
+def run_digest_timer():
+    """Background loop that sends digests on schedule, or early when woken"""
+    while True:
+        try:
+            flush_digest_if_due()
+        except Exception as e:
+            print(f"Error in digest timer: {str(e)}")
+        digest_wakeup.wait(DIGEST_CHECK_SECONDS)
+        digest_wakeup.clear()
+
 def verify_origin():
     """Verify the request is coming from an allowed origin"""
     origin = request.headers.get('Origin', '')
@@ -127,53 +430,36 @@ def send_outfit():
 
         # Decode base64 image
         image_bytes = base64.b64decode(image_data)
-
-        # Get email credentials from environment
-        email_service = os.getenv('EMAIL_SERVICE', 'gmail')
-        email_user = os.getenv('EMAIL_USER')
-        email_pass = os.getenv('EMAIL_PASS')
-        notification_email = os.getenv('NOTIFICATION_EMAIL')
-
-        if not all([email_user, email_pass, notification_email]):
+        if not image_bytes.startswith(PNG_SIGNATURE):
+            return jsonify({'success': False, 'error': 'Image must be a PNG'}), 400
+
+        # Item ids for the history log, if the page sent them. The site can be
+        # deployed with items this server doesn't know yet, so an outfit that
+        # doesn't match item_ids.json is left out of the history but still sent.
+        outfit_ids = None
+        if os.path.exists(ITEM_IDS_FILE):
+            try:
+                outfit_ids = parse_outfit(data)[2]
+            except OutfitError as e:
+                print(f"Not logging outfit history: {str(e)}")
+
+        if not get_email_config():
             return jsonify({'success': False, 'error': 'Email configuration missing'}), 500
 
-        # Create email message
-        msg = MIMEMultipart()
-        msg['From'] = email_user
-        msg['To'] = notification_email
-        msg['Subject'] = 'New Outfit from Outfit Creator!'
+        if DIGEST_MODE:
+            if not queue_outfit(image_bytes):
+                return jsonify({'success': True, 'message': 'Outfit already queued for Hannah!'})
+            rate_limit_storage[client_ip].append(time.time())
+            if outfit_ids is not None:
+                outfit_history.append(outfit_ids, 'send-outfit')
+            return jsonify({'success': True, 'message': 'Outfit queued for Hannah!'})
 
-        # Email body
-        body = """
-        <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2>Someone created a new outfit for you!</h2>
-                <p>Check out this outfit combination from your Outfit Creator:</p>
-                <p><img src="cid:outfit_image" style="max-width: 600px; border: 2px solid #000;"></p>
-                <p style="color: #666; font-size: 12px; margin-top: 30px;">
-                    Generated from Hannahbunnn's Outfit Creator
-                </p>
-            </body>
-        </html>
-        """
-
-        msg.attach(MIMEText(body, 'html'))
-
-        # Attach image
-        image = MIMEImage(image_bytes, name='outfit.png')
-        image.add_header('Content-ID', '<outfit_image>')
-        image.add_header('Content-Disposition', 'inline', filename='outfit.png')
-        msg.attach(image)
-
-        # Send email via Gmail SMTP
-        if email_service == 'gmail':
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(email_user, email_pass)
-                server.send_message(msg)
+        send_email(build_outfit_email([image_bytes]))
 
         # Record successful request for rate limiting
         rate_limit_storage[client_ip].append(time.time())
+        if outfit_ids is not None:
+            outfit_history.append(outfit_ids, 'send-outfit')
 
         return jsonify({'success': True, 'message': 'Outfit sent to Hannah successfully!'})
 
@@ -181,6 +467,140 @@ def send_outfit():
         print(f"Error sending email: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def get_item_catalog():
+    """Load the item id table once and reuse it for every outfit"""
+    if item_catalog_data['catalog'] is None:
+        item_catalog_data['catalog'] = ItemCatalog(ITEM_IDS_FILE)
+    return item_catalog_data['catalog']
+
+def parse_outfit(data):
+    """Read the outfit from a request body as (outfit, packed, ids).
+
+    Accepts either a packed string or an outfit object and returns
+    (None, None, None) when neither is present. Raises OutfitError for
+    invalid outfits.
+    """
+    catalog = get_item_catalog()
+    if data.get('packed') is not None:
+        packed = data['packed']
+        outfit = catalog.decode(packed)
+        return outfit, packed, catalog.outfit_ids(outfit)
+    if data.get('outfit') is not None:
+        outfit = data['outfit']
+        ids = catalog.outfit_ids(outfit)
+        return outfit, pack_ids(ids), ids
+    return None, None, None
+
+def get_color_index():
+    """Load the colour index once and reuse it for every query"""
+    if color_index_data['index'] is None:
+        color_index_data['index'] = ColorIndex(INDEX_FILE)
+    return color_index_data['index']
+
+@app.route('/outfits/coordinated', methods=['GET'])
+def coordinated_outfit():
+    """Get the items closest to a target colour in each category"""
+    try:
+        color_param = request.args.get('color')
+        if not color_param:
+            return jsonify({'success': False, 'error': 'No color provided'}), 400
+
+        try:
+            color = parse_hex_color(color_param)
+            limit = int(request.args.get('limit', 1))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        if not 1 <= limit <= MAX_COORDINATED_MATCHES:
+            return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_COORDINATED_MATCHES}'}), 400
+
+        if not os.path.exists(INDEX_FILE):
+            return jsonify({'success': False, 'error': 'Color index not built'}), 503
+
+        index = get_color_index()
+        categories_param = request.args.get('categories')
+        categories = categories_param.split(',') if categories_param else list(index.categories)
+
+        matches = index.coordinated_outfit(color, categories, limit)
+
+        # Best match per category, in the same shape the OBS overlay uses
+        outfit = {category: items[0][0] for category, items in matches.items() if items}
+
+        return jsonify({
+            'success': True,
+            'color': '#%02x%02x%02x' % color,
+            'outfit': outfit,
+            'matches': {
+                category: [{'item': filename, 'distance': round(distance, 1)} for filename, distance in items]
+                for category, items in matches.items()
+            },
+        })
+
+    except Exception as e:
+        print(f"Error finding coordinated outfit: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/outfits/history', methods=['GET'])
+def outfit_history_page():
+    """Get a page of past outfits, oldest first, starting at a cursor"""
+    try:
+        try:
+            cursor = int(request.args.get('cursor', 0))
+            limit = int(request.args.get('limit', 20))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'cursor and limit must be integers'}), 400
+
+        if cursor < 0:
+            return jsonify({'success': False, 'error': 'cursor must not be negative'}), 400
+        if not 1 <= limit <= MAX_HISTORY_PAGE:
+            return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_HISTORY_PAGE}'}), 400
+
+        events, next_cursor = outfit_history.read(cursor, limit)
+
+        catalog = get_item_catalog() if os.path.exists(ITEM_IDS_FILE) else None
+        for event in events:
+            event['packed'] = pack_ids(event['items'])
+            # Items removed from the catalogue since the event can't be shown
+            try:
+                event['outfit'] = catalog.outfit_from_ids(event['items']) if catalog else None
+            except OutfitError:
+                event['outfit'] = None
+
+        return jsonify({
+            'success': True,
+            'outfits': events,
+            'next_cursor': next_cursor,
+            'total': len(outfit_history),
+        })
+
+    except Exception as e:
+        print(f"Error reading outfit history: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/outfits/popular', methods=['GET'])
+def popular_items():
+    """Get the items that appear in the most logged outfits"""
+    try:
+        try:
+            limit = int(request.args.get('limit', 10))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+
+        if not 1 <= limit <= MAX_POPULAR_ITEMS:
+            return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_POPULAR_ITEMS}'}), 400
+
+        catalog = get_item_catalog() if os.path.exists(ITEM_IDS_FILE) else None
+        items = []
+        for item_id, count in outfit_history.most_popular(limit):
+            category, filename = catalog.by_id.get(item_id, (None, None)) if catalog else (None, None)
+            items.append({'id': item_id, 'category': category, 'item': filename, 'count': count})
+
+        return jsonify({'success': True, 'items': items})
+
+    except Exception as e:
+        print(f"Error counting popular items: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -198,17 +618,33 @@ def save_obs_outfit():
         return response
 
     try:
-        data = request.json
-        outfit = data.get('outfit')
-
+        # Reject oversized bodies before parsing them
+        if request.content_length is None:
+            return jsonify({'success': False, 'error': 'Content-Length required'}), 411
+        if request.content_length > MAX_OUTFIT_PAYLOAD_SIZE:
+            return jsonify({'success': False, 'error': 'Outfit too large'}), 413
+
+        if not os.path.exists(ITEM_IDS_FILE):
+            return jsonify({'success': False, 'error': 'Item catalogue not built'}), 503
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Invalid JSON'}), 400
+
+        try:
+            outfit, packed, ids = parse_outfit(data)
+        except OutfitError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         if outfit is None:
             return jsonify({'success': False, 'error': 'No outfit data provided'}), 400
 
         # Store the outfit
         obs_outfit_data['outfit'] = outfit
-        print(f"Outfit saved: {outfit}")
+        obs_outfit_data['packed'] = packed
+        outfit_history.append(ids, 'obs')
+        print(f"Outfit saved: {packed}")
 
-        return jsonify({'success': True, 'message': 'Outfit saved for OBS'})
+        return jsonify({'success': True, 'message': 'Outfit saved for OBS', 'packed': packed})
 
     except Exception as e:
         print(f"Error saving OBS outfit: {str(e)}")
@@ -218,7 +654,11 @@ def save_obs_outfit():
 def get_obs_outfit():
     """Get outfit data for OBS overlay"""
     try:
-        response = jsonify({'success': True, 'outfit': obs_outfit_data['outfit']})
+        response = jsonify({
+            'success': True,
+            'outfit': obs_outfit_data['outfit'],
+            'packed': obs_outfit_data['packed'],
+        })
         response.headers.add('Access-Control-Allow-Origin', '*')
         return response
     except Exception as e:
@@ -230,6 +670,7 @@ def clear_obs_outfit():
     """Clear outfit data for OBS overlay"""
     try:
         obs_outfit_data['outfit'] = None
+        obs_outfit_data['packed'] = None
         print("OBS outfit cleared")
         return jsonify({'success': True, 'message': 'OBS outfit cleared'})
 
@@ -237,5 +678,17 @@ def clear_obs_outfit():
         print(f"Error clearing OBS outfit: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def start_digest_timer():
+    """Start the digest thread; queued outfits from before a restart are sent on its first check"""
+    threading.Thread(target=run_digest_timer, daemon=True).start()
+
 if __name__ == '__main__':
+    # The debug reloader's parent process only watches files; the child it
+    # starts (marked by WERKZEUG_RUN_MAIN) is the one serving requests
+    if DIGEST_MODE and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_digest_timer()
     app.run(host='0.0.0.0', port=5001, debug=True)
+elif DIGEST_MODE:
+    # Imported by gunicorn: every worker runs a timer, and the queue's file
+    # lock stops two of them flushing the same outfits
+    start_digest_timer()
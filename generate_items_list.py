@@ -4,12 +4,46 @@ Generate a static JSON file containing all clothing items for each category.
 This allows the webpage to work as a static site on GitHub Pages.
 """
 
+import argparse
 import os
 import json
 
-def generate_items_list():
+from config import CLOTHES_DIR, ITEMS_FILE, ITEM_IDS_FILE
+
+def assign_item_ids(items_data, ids_file=ITEM_IDS_FILE):
+    """Give every item a stable integer id and write the lookup table.
+
+    Ids already in ids_file are kept, new items get the next unused id,
+    and ids of removed items are never handed out again. Ids start at 1.
+    The table is written as {"next_id": N, "items": [[id, category, filename], ...]}.
+    """
+    existing = {}
+    next_id = 1
+    if os.path.exists(ids_file):
+        with open(ids_file) as f:
+            table = json.load(f)
+        next_id = table['next_id']
+        existing = {(category, filename): item_id for item_id, category, filename in table['items']}
+
+    items = []
+    new_ids = 0
+    for category, filenames in items_data.items():
+        for filename in filenames:
+            item_id = existing.get((category, filename))
+            if item_id is None:
+                item_id = next_id
+                next_id += 1
+                new_ids += 1
+            items.append([item_id, category, filename])
+
+    items.sort()
+    with open(ids_file, 'w') as f:
+        json.dump({'next_id': next_id, 'items': items}, f, separators=(',', ':'))
+
+    return new_ids
+
+def generate_items_list(clothes_dir=CLOTHES_DIR, output_file=ITEMS_FILE, ids_file=ITEM_IDS_FILE):
     """Generate items list for all clothing categories."""
-    clothes_dir = 'clothes'
     categories = ['tops', 'outwear', 'dresses', 'bottoms', 'shoes', 'bags', 'accessories', 'molly']
 
     items_data = {}
@@ -35,13 +69,21 @@ def generate_items_list():
         print(f"Found {len(items)} items in {category}")
 
     # Write to JSON file
-    output_file = 'items.json'
     with open(output_file, 'w') as f:
         json.dump(items_data, f, indent=2)
 
+    new_ids = assign_item_ids(items_data, ids_file)
+
     print(f"\nSuccessfully generated {output_file}")
+    print(f"Assigned {new_ids} new item ids in {ids_file}")
     print(f"Total categories: {len(items_data)}")
     print(f"Total items: {sum(len(items) for items in items_data.values())}")
 
-if __name__ == '__main__':
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate items.json from the clothes folders')
+    parser.parse_args(argv)
+
     generate_items_list()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the Anthropic client the sorter uses.
+
+LocalAnthropic mimics client.messages.create and the Message Batches
+calls (client.messages.batches.create / retrieve / results) closely
+enough to run sort_clothes.py end to end without an API key or network.
+Batches are persisted to a JSON file and only report "ended" after a
+short delay, so polling, interruption and resuming can all be tried out
+locally.
+
+It is not a classifier: each image is assigned a category derived from
+a hash of its bytes, so the same image always lands in the same place.
+
+Usage:
+    python3 sort_clothes.py --bulk --local
+"""
+import base64
+import hashlib
+import json
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+from config import ROOT_DIR
+
+STATE_FILE = ROOT_DIR / ".local_anthropic_batches.json"
+PROCESSING_SECONDS = 3  # Default time a batch reports "in_progress"
+
+CATEGORIES = ["tops_dresses", "bottoms", "shoes", "bags", "accessories"]
+
+
+def classify(params):
+    """Pick a deterministic category for the image in a request's params."""
+    for block in params["messages"][0]["content"]:
+        if block["type"] == "image":
+            digest = hashlib.sha256(base64.b64decode(block["source"]["data"])).digest()
+            return CATEGORIES[digest[0] % len(CATEGORIES)]
+    return "unknown"
+
+
+def make_message(text):
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+
+
+class LocalBatches:
+    """Stand-in for client.messages.batches."""
+
+    def __init__(self, state_file, processing_seconds):
+        self.state_file = Path(state_file)
+        self.processing_seconds = processing_seconds
+
+    def _load(self):
+        if self.state_file.exists():
+            with open(self.state_file) as f:
+                return json.load(f)
+        return {}
+
+    def _save(self, batches):
+        with open(self.state_file, "w") as f:
+            json.dump(batches, f)
+
+    def _to_batch(self, batch_id, batch):
+        ended = time.time() - batch["created_at"] >= self.processing_seconds
+        return SimpleNamespace(
+            id=batch_id,
+            processing_status="ended" if ended else "in_progress",
+            request_counts=SimpleNamespace(
+                processing=0 if ended else len(batch["results"]),
+                succeeded=len(batch["results"]) if ended else 0,
+                errored=0,
+                canceled=0,
+                expired=0,
+            ),
+        )
+
+    def create(self, requests):
+        batches = self._load()
+        batch_id = f"msgbatch_local_{uuid.uuid4().hex}"
+        batches[batch_id] = {
+            "created_at": time.time(),
+            # Only the answers are stored, not the (large) image payloads
+            "results": {request["custom_id"]: classify(request["params"]) for request in requests},
+        }
+        self._save(batches)
+        return self._to_batch(batch_id, batches[batch_id])
+
+    def retrieve(self, batch_id):
+        batches = self._load()
+        if batch_id not in batches:
+            raise KeyError(f"Unknown batch {batch_id}")
+        return self._to_batch(batch_id, batches[batch_id])
+
+    def results(self, batch_id):
+        batches = self._load()
+        if self.retrieve(batch_id).processing_status != "ended":
+            raise RuntimeError(f"Batch {batch_id} is still processing")
+        for custom_id, text in batches[batch_id]["results"].items():
+            yield SimpleNamespace(
+                custom_id=custom_id,
+                result=SimpleNamespace(type="succeeded", message=make_message(text)),
+            )
+
+
+class LocalMessages:
+    """Stand-in for client.messages."""
+
+    def __init__(self, state_file, processing_seconds):
+        self.batches = LocalBatches(state_file, processing_seconds)
+
+    def create(self, **params):
+        return make_message(classify(params))
+
+
+class LocalAnthropic:
+    """Drop-in replacement for anthropic.Anthropic in sort_clothes.py."""
+
+    def __init__(self, state_file=STATE_FILE, processing_seconds=PROCESSING_SECONDS):
+        self.messages = LocalMessages(state_file, processing_seconds)
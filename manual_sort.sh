@@ -1,5 +1,5 @@
 #!/bin/bash
-cd /Users/hannahlyon/Documents/Projects/dress_up/clothes
+cd "${DRESSUP_CLOTHES_DIR:-$(dirname "$0")/clothes}"
 
 # Get all PNG files in the current directory
 FILES=(*.png)
@@ -11,14 +11,13 @@ q = quit
 u = undo last move
 """
 
-import os
+import argparse
 import shutil
-from pathlib import Path
-from PIL import Image
-import sys
+
+from config import CLOTHES_DIR
 
 # Base directory
-BASE_DIR = Path("/Users/hannahlyon/Documents/Projects/dress_up/clothes")
+BASE_DIR = CLOTHES_DIR
 
 # Categories
 CATEGORIES = {
@@ -36,6 +35,8 @@ def get_unsorted_images():
 
 def show_image(image_path):
     """Display image using default viewer"""
+    from PIL import Image
+
     try:
         img = Image.open(image_path)
         img.show()
@@ -52,7 +53,10 @@ def move_image(image_path, category):
     shutil.move(str(image_path), str(dest_path))
     return dest_path
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interactively sort unsorted clothing images")
+    parser.parse_args(argv)
+
     images = get_unsorted_images()
     total = len(images)
 
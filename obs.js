@@ -5,6 +5,9 @@ const POLL_INTERVAL = 2000; // Check for updates every 2 seconds
 
 let currentOutfit = null;
 
+// Crop offsets of the trimmed image copies (see trim_images.py)
+let trims = {};
+
 // Get API URL based on environment
 function getApiUrl() {
     return window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1'
@@ -95,17 +98,11 @@ function createOutfitItem(category, itemFilename) {
     label.className = 'outfit-item-label';
     label.textContent = category;
 
-    const img = document.createElement('img');
-    img.className = 'outfit-item-image';
-    img.src = `clothes/${category}/${itemFilename}`;
-    img.alt = `${category} - ${itemFilename}`;
-    img.loading = 'eager';
-
     // Handle image load errors
-    img.onerror = () => {
+    const img = createItemImage(category, itemFilename, () => {
         img.style.display = 'none';
         label.style.display = 'none';
-    };
+    });
 
     outfitItem.appendChild(label);
     outfitItem.appendChild(img);
@@ -113,6 +110,66 @@ function createOutfitItem(category, itemFilename) {
     return outfitItem;
 }
 
+// Load trims.json; without it every item uses its padded original
+async function loadTrims() {
+    try {
+        const response = await fetch('trims.json');
+        if (response.ok) {
+            trims = await response.json();
+        }
+    } catch (error) {
+        console.error('Error loading trims:', error);
+    }
+}
+
+// Create the image for an item. Items with transparent padding load their
+// trimmed copy, placed at its original offset inside a frame with the
+// original canvas's aspect ratio (same as createItemImage in script.js).
+function createItemImage(category, itemFilename, onError) {
+    const originalSrc = `clothes/${category}/${itemFilename}`;
+    const trim = (trims[category] || {})[itemFilename];
+
+    const img = document.createElement('img');
+    img.alt = `${category} - ${itemFilename}`;
+    img.loading = 'eager';
+
+    if (!trim) {
+        img.className = 'outfit-item-image';
+        img.src = originalSrc;
+        img.onerror = onError;
+        return img;
+    }
+
+    const box = document.createElement('div');
+    box.className = 'outfit-item-image trimmed-box';
+    box.style.setProperty('--w', trim.width);
+    box.style.setProperty('--h', trim.height);
+
+    const frame = document.createElement('div');
+    frame.className = 'trimmed-frame';
+
+    img.src = `clothes_trimmed/${category}/${itemFilename}`;
+    img.style.left = `${(100 * trim.left) / trim.width}%`;
+    img.style.top = `${(100 * trim.top) / trim.height}%`;
+    img.style.width = `${(100 * trim.trimmed_width) / trim.width}%`;
+    img.style.height = `${(100 * trim.trimmed_height) / trim.height}%`;
+
+    // If the trimmed copy is missing, the original fills the same frame
+    img.onerror = () => {
+        img.onerror = () => {
+            box.style.display = 'none';
+            onError();
+        };
+        img.src = originalSrc;
+        img.style.left = img.style.top = '0';
+        img.style.width = img.style.height = '100%';
+    };
+
+    frame.appendChild(img);
+    box.appendChild(frame);
+    return box;
+}
+
 // Fetch outfit from server
 async function fetchOutfit() {
     try {
@@ -147,8 +204,9 @@ async function checkForUpdates() {
 }
 
 // Initialize
-function init() {
+async function init() {
     applyStyles();
+    await loadTrims();
     checkForUpdates();
 
     // Poll for updates from server
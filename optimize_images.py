@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Losslessly recompress the clothing PNGs to cut the page's transfer size.
+
+Every image under clothes/ is re-encoded in parallel across all cores:
+ancillary chunks (text, EXIF, ICC, timestamps) are dropped, images with
+256 colours or fewer are tried as exact palette PNGs, and each zlib
+strategy is tried with maximum compression. A result is only written
+when it is smaller AND decodes to exactly the same RGBA pixels.
+
+Content hashes of already-optimized files are kept in a cache so only
+new or changed images are processed on later runs.
+
+Requires Pillow:
+    pip3 install Pillow
+
+Usage:
+    python3 optimize_images.py
+    python3 optimize_images.py --workers 4 --dry-run
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from config import CLOTHES_DIR, OPTIMIZE_CACHE_FILE as CACHE_FILE
+
+# zlib strategies accepted by Pillow's PNG encoder via `compress_type`
+ZLIB_STRATEGIES = {
+    'default': 0,
+    'filtered': 1,
+    'huffman_only': 2,
+    'rle': 3,
+    'fixed': 4,
+}
+
+
+def file_hash(data):
+    """Return the SHA-256 hex digest of some bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def to_exact_palette(img):
+    """Convert an RGBA image to palette mode without losing any colour.
+
+    Returns None when the image has more than 256 distinct colours.
+    """
+    from PIL import Image
+
+    colors = img.getcolors(256)
+    if colors is None:
+        return None
+
+    palette = [color for _, color in colors]
+    lookup = {color: index for index, color in enumerate(palette)}
+
+    paletted = Image.new('P', img.size)
+    paletted.putpalette([channel for color in palette for channel in color], rawmode='RGBA')
+    paletted.putdata([lookup[pixel] for pixel in img.getdata()])
+    return paletted
+
+
+def encode_candidates(img):
+    """Yield (label, png_bytes) for every encoding worth trying."""
+    variants = [('rgba', img)]
+    paletted = to_exact_palette(img)
+    if paletted is not None:
+        variants.insert(0, ('palette', paletted))
+
+    for mode_label, variant in variants:
+        for strategy_label, strategy in ZLIB_STRATEGIES.items():
+            buffer = io.BytesIO()
+            # No pnginfo/icc_profile/exif passed, so only critical chunks
+            # (plus tRNS for palettes) are written
+            variant.save(buffer, format='PNG', compress_level=9, compress_type=strategy)
+            yield f'{mode_label}/{strategy_label}', buffer.getvalue()
+
+
+def pixels_match(original, png_bytes):
+    """Check the re-encoded PNG decodes to the original RGBA pixels."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png_bytes)) as candidate:
+        return candidate.convert('RGBA').tobytes() == original.tobytes()
+
+
+def optimize_file(path):
+    """Recompress a single PNG in place if a smaller lossless encoding exists.
+
+    Runs in a worker process. Returns a dict describing the outcome.
+    """
+    from PIL import Image
+
+    path = Path(path)
+    original_bytes = path.read_bytes()
+    result = {
+        'path': str(path),
+        'before': len(original_bytes),
+        'after': len(original_bytes),
+        'encoding': None,
+        'hash': file_hash(original_bytes),
+        'error': None,
+    }
+
+    try:
+        with Image.open(io.BytesIO(original_bytes)) as img:
+            original = img.convert('RGBA')
+
+        best_label, best_bytes = None, original_bytes
+        for label, candidate in encode_candidates(original):
+            if len(candidate) < len(best_bytes):
+                best_label, best_bytes = label, candidate
+
+        if best_label is not None and pixels_match(original, best_bytes):
+            result['after'] = len(best_bytes)
+            result['encoding'] = best_label
+            result['hash'] = file_hash(best_bytes)
+            result['optimized_bytes'] = best_bytes
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def cache_key(path):
+    """Key images by their path inside clothes/ so the cache is portable."""
+    return Path(path).relative_to(CLOTHES_DIR).as_posix()
+
+
+def load_cache():
+    """Load {category/filename: sha256 of last optimized content}."""
+    if CACHE_FILE.exists():
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache):
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def find_changed_images(cache):
+    """Return PNG paths whose content hash differs from the cache."""
+    changed = []
+    for path in sorted(CLOTHES_DIR.rglob('*.png')):
+        if cache.get(cache_key(path)) != file_hash(path.read_bytes()):
+            changed.append(path)
+    return changed
+
+
+def write_atomically(path, data):
+    """Replace a file's contents without leaving a half-written PNG behind."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def print_report(results):
+    """Print bytes saved per category and overall."""
+    per_category = defaultdict(lambda: {'files': 0, 'before': 0, 'after': 0})
+    for result in results:
+        category = Path(result['path']).parent.name
+        totals = per_category[category]
+        totals['files'] += 1
+        totals['before'] += result['before']
+        totals['after'] += result['after']
+
+    print(f"\n{'category':<14} {'files':>6} {'before':>12} {'after':>12} {'saved':>8}")
+    total_before = total_after = 0
+    for category, totals in sorted(per_category.items()):
+        saved = totals['before'] - totals['after']
+        percent = 100 * saved / totals['before'] if totals['before'] else 0
+        print(f"{category:<14} {totals['files']:>6} {totals['before']:>12,} "
+              f"{totals['after']:>12,} {percent:>7.1f}%")
+        total_before += totals['before']
+        total_after += totals['after']
+
+    saved = total_before - total_after
+    print(f"\nTotal saved: {saved:,} bytes ({saved / (1024 * 1024):.2f} MB)")
+
+
+def optimize_images(workers=None, dry_run=False):
+    """Optimize every new or changed PNG under CLOTHES_DIR."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache = load_cache()
+    changed = find_changed_images(cache)
+
+    if not changed:
+        print("All images are already optimized.")
+        return []
+
+    print(f"Optimizing {len(changed)} images...")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(optimize_file, changed, chunksize=4):
+            optimized_bytes = result.pop('optimized_bytes', None)
+
+            if result['error']:
+                print(f"Error processing {result['path']}: {result['error']}")
+                continue
+
+            if optimized_bytes is not None and not dry_run:
+                write_atomically(Path(result['path']), optimized_bytes)
+
+            if not dry_run:
+                cache[cache_key(result['path'])] = result['hash']
+            results.append(result)
+
+    if not dry_run:
+        save_cache(cache)
+
+    print_report(results)
+    if dry_run:
+        print("(dry run - no files were changed)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Losslessly recompress the clothing PNGs')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per core)')
+    parser.add_argument('--dry-run', action='store_true', help='Report savings without writing files')
+    args = parser.parse_args(argv)
+
+    optimize_images(workers=args.workers, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
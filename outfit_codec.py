@@ -0,0 +1,159 @@
+"""
+Validate outfits and convert them to and from compact item ids.
+
+Outfits travel as {category: filename} objects, with accessories and
+molly allowing a list of filenames. item_ids.json (written by
+generate_items_list.py) gives every catalogue item a stable integer id.
+ItemCatalog loads it once into dictionaries so each item in an outfit is
+checked with a single hash lookup.
+
+Packed encoding: the outfit's ids sorted ascending, each written as a
+fixed number of bits (the bit length of the largest id), preceded by one
+byte holding that width and encoded as unpadded URL-safe base64. A
+five-item outfit from the current catalogue packs into about 10
+characters. Ids start at 1, so a zero left over from padding marks the
+end of the list. script.js implements the same encoding in packOutfit().
+"""
+import base64
+import binascii
+import json
+
+from config import ITEM_IDS_FILE
+
+# Categories where several items can be selected at once (see script.js)
+MULTI_SELECT_CATEGORIES = {'accessories', 'molly'}
+
+MAX_OUTFIT_ITEMS = 32  # Items across all categories in one outfit
+MAX_PACKED_LENGTH = 64  # Characters in a packed outfit string
+MAX_ID_BITS = 32
+
+
+class OutfitError(ValueError):
+    """Raised for outfits that are malformed or reference unknown items."""
+
+
+class ItemCatalog:
+    """Two-way lookup between (category, filename) and integer item ids."""
+
+    def __init__(self, path=ITEM_IDS_FILE):
+        with open(path) as f:
+            table = json.load(f)
+
+        self.by_id = {}
+        self.by_item = {}
+        for item_id, category, filename in table['items']:
+            self.by_id[item_id] = (category, filename)
+            self.by_item[(category, filename)] = item_id
+        self.categories = {category for category, _ in self.by_item}
+
+    def outfit_ids(self, outfit):
+        """Validate an outfit object and return its item ids, sorted.
+
+        Raises OutfitError if the outfit is malformed, too large or refers
+        to items that are not in the catalogue.
+        """
+        if not isinstance(outfit, dict):
+            raise OutfitError('Outfit must be an object')
+        if len(outfit) > len(self.categories):
+            raise OutfitError('Too many categories')
+
+        ids = set()
+        for category, selection in outfit.items():
+            if category not in self.categories:
+                raise OutfitError(f'Unknown category: {category}')
+
+            if isinstance(selection, list) and category in MULTI_SELECT_CATEGORIES:
+                filenames = selection
+            elif isinstance(selection, str):
+                filenames = [selection]
+            else:
+                raise OutfitError(f'Invalid selection for {category}')
+
+            if len(ids) + len(filenames) > MAX_OUTFIT_ITEMS:
+                raise OutfitError('Too many items')
+
+            for filename in filenames:
+                item_id = self.by_item.get((category, filename)) if isinstance(filename, str) else None
+                if item_id is None:
+                    raise OutfitError(f'Unknown item in {category}')
+                ids.add(item_id)
+
+        return sorted(ids)
+
+    def outfit_from_ids(self, ids):
+        """Build an outfit object from item ids.
+
+        Raises OutfitError for unknown ids or several items in a
+        single-select category.
+        """
+        outfit = {}
+        for item_id in ids:
+            item = self.by_id.get(item_id)
+            if item is None:
+                raise OutfitError(f'Unknown item id: {item_id}')
+            category, filename = item
+
+            if category in MULTI_SELECT_CATEGORIES:
+                outfit.setdefault(category, []).append(filename)
+            elif category in outfit:
+                raise OutfitError(f'Only one item allowed in {category}')
+            else:
+                outfit[category] = filename
+        return outfit
+
+    def encode(self, outfit):
+        """Validate an outfit and return its packed string."""
+        return pack_ids(self.outfit_ids(outfit))
+
+    def decode(self, packed):
+        """Validate a packed string and return the outfit object."""
+        return self.outfit_from_ids(unpack_ids(packed))
+
+
+def pack_ids(ids):
+    """Pack sorted positive ids into a URL-safe base64 string."""
+    if not ids:
+        return ''
+
+    width = max(ids).bit_length()
+    bits = ''.join(format(item_id, f'0{width}b') for item_id in ids)
+    bits += '0' * (-len(bits) % 8)
+    payload = bytes([width]) + int(bits, 2).to_bytes(len(bits) // 8, 'big')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def unpack_ids(packed):
+    """Unpack a string from pack_ids() back into a list of ids.
+
+    Raises OutfitError if the string is too long or not a valid encoding.
+    """
+    if not isinstance(packed, str) or len(packed) > MAX_PACKED_LENGTH:
+        raise OutfitError('Invalid packed outfit')
+    if not packed:
+        return []
+
+    try:
+        payload = base64.urlsafe_b64decode(packed + '=' * (-len(packed) % 4))
+    except (binascii.Error, ValueError):
+        raise OutfitError('Invalid packed outfit')
+
+    if len(payload) < 2 or not 1 <= payload[0] <= MAX_ID_BITS:
+        raise OutfitError('Invalid packed outfit')
+
+    width = payload[0]
+    value = int.from_bytes(payload[1:], 'big')
+    total_bits = (len(payload) - 1) * 8
+
+    ids = []
+    for i in range(total_bits // width):
+        shift = total_bits - (i + 1) * width
+        item_id = (value >> shift) & ((1 << width) - 1)
+        if item_id == 0:
+            break
+        if ids and item_id <= ids[-1]:
+            raise OutfitError('Invalid packed outfit')
+        ids.append(item_id)
+
+    if len(ids) > MAX_OUTFIT_ITEMS:
+        raise OutfitError('Too many items')
+    return ids
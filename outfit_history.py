@@ -0,0 +1,212 @@
+"""
+Append-only on-disk log of outfit events.
+
+Each event stores only item ids, a timestamp and where it came from, never
+images. Records are packed little-endian:
+
+    uint32 timestamp | uint8 source | uint8 item count | uint32 id * count
+
+so a five-item outfit takes 26 bytes. Appending is a single write to the
+end of the log.
+
+A sparse index file sits next to the log, holding the byte offset of
+every INDEX_INTERVAL-th record as a uint64. Record number n is found by
+reading index entry n // INDEX_INTERVAL at a fixed position and skipping
+at most INDEX_INTERVAL - 1 records from there, so history queries never
+scan the whole file.
+
+The log may be shared by several server processes (gunicorn workers).
+Appends and the bookkeeping they depend on happen under an flock on the
+log, and each process re-reads the end of the log from the file rather
+than trusting its own counters, so the index never disagrees with it.
+
+Popularity counts are built with one pass over the log the first time
+they are asked for; later queries only read the records appended since.
+"""
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import fcntl  # Not available on Windows, where only threads are locked out
+except ImportError:
+    fcntl = None
+
+from config import HISTORY_FILE, HISTORY_INDEX_FILE
+
+HEADER = struct.Struct('<IBB')
+ITEM_ID = struct.Struct('<I')
+INDEX_ENTRY = struct.Struct('<Q')
+INDEX_INTERVAL = 64  # Records between index entries
+
+MAX_EVENT_ITEMS = 255  # Item count is stored in one byte
+
+# Where an event came from, stored as one byte
+SOURCES = ['send-outfit', 'obs']
+
+
+class OutfitHistory:
+    """Append outfit events to the log and read them back by position."""
+
+    def __init__(self, log_path=HISTORY_FILE, index_path=HISTORY_INDEX_FILE):
+        self.log_path = str(log_path)
+        self.index_path = str(index_path)
+        self.lock = threading.Lock()
+        # Records and bytes in the log as of the last time it was locked
+        self.count = 0
+        self.end_offset = 0
+        self.popularity = None
+        self.popularity_offset = 0
+
+        # Make sure both files exist before opening them for reading
+        for path in (self.log_path, self.index_path):
+            open(path, 'ab').close()
+
+        with self._locked():
+            pass
+
+    @contextmanager
+    def _locked(self):
+        """Hold the log against other threads and processes.
+
+        Yields the log opened for appending, with count and end_offset
+        brought up to date with anything other processes appended.
+        """
+        with self.lock:
+            with open(self.log_path, 'ab', buffering=0) as log_file:
+                if fcntl:
+                    fcntl.flock(log_file, fcntl.LOCK_EX)
+                self._sync(os.fstat(log_file.fileno()).st_size)
+                yield log_file
+
+    def _sync(self, log_size):
+        """Update count and end_offset from the files. Caller holds the lock."""
+        index_entries = os.path.getsize(self.index_path) // INDEX_ENTRY.size
+        expected_entries = -(-self.count // INDEX_INTERVAL)
+        if log_size == self.end_offset and index_entries == expected_entries:
+            return  # Nobody else has appended since we last looked
+        self.count, self.end_offset = self._recover(index_entries)
+
+    def _read_index_entry(self, index_file, entry):
+        index_file.seek(entry * INDEX_ENTRY.size)
+        return INDEX_ENTRY.unpack(index_file.read(INDEX_ENTRY.size))[0]
+
+    def _read_record(self, log_file):
+        """Read the record at the current position, or None at a clean or torn end."""
+        header = log_file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+        timestamp, source, item_count = HEADER.unpack(header)
+        body = log_file.read(item_count * ITEM_ID.size)
+        if len(body) < item_count * ITEM_ID.size:
+            return None
+        ids = [item_id for (item_id,) in ITEM_ID.iter_unpack(body)]
+        return timestamp, source, ids
+
+    def _recover(self, index_entries):
+        """Find the record count and end of the log from the last index entry.
+
+        Only the records after the last indexed one are read. A record left
+        half-written by a crash is cut off, and index entries missing for
+        records that did make it to disk are added back. Caller holds the lock.
+        """
+        with open(self.log_path, 'rb') as log_file, open(self.index_path, 'r+b') as index_file:
+            # Drop a partially written trailing index entry
+            index_file.truncate(index_entries * INDEX_ENTRY.size)
+
+            if index_entries:
+                count = (index_entries - 1) * INDEX_INTERVAL
+                offset = self._read_index_entry(index_file, index_entries - 1)
+            else:
+                count, offset = 0, 0
+
+            log_file.seek(offset)
+            index_file.seek(0, os.SEEK_END)
+            while True:
+                record = self._read_record(log_file)
+                if record is None:
+                    break
+                if count % INDEX_INTERVAL == 0 and count // INDEX_INTERVAL >= index_entries:
+                    index_file.write(INDEX_ENTRY.pack(offset))
+                count += 1
+                offset = log_file.tell()
+
+        if os.path.getsize(self.log_path) != offset:
+            with open(self.log_path, 'r+b') as log_file:
+                log_file.truncate(offset)
+
+        return count, offset
+
+    def __len__(self):
+        """Number of events in the log, including other processes' appends."""
+        with self._locked():
+            return self.count
+
+    def append(self, ids, source, timestamp=None):
+        """Append an outfit event and return its record number."""
+        if len(ids) > MAX_EVENT_ITEMS:
+            raise ValueError('Too many items in outfit event')
+        if timestamp is None:
+            timestamp = time.time()
+
+        record = HEADER.pack(int(timestamp), SOURCES.index(source), len(ids))
+        record += b''.join(ITEM_ID.pack(item_id) for item_id in ids)
+
+        with self._locked() as log_file:
+            log_file.write(record)
+            if self.count % INDEX_INTERVAL == 0:
+                with open(self.index_path, 'ab', buffering=0) as index_file:
+                    index_file.write(INDEX_ENTRY.pack(self.end_offset))
+
+            position = self.count
+            self.count += 1
+            self.end_offset += len(record)
+
+        return position
+
+    def read(self, cursor=0, limit=20):
+        """Return up to `limit` events starting at record number `cursor`.
+
+        Each event is {'cursor', 'timestamp', 'source', 'items'}. Also
+        returns the cursor for the next page, or None after the last event.
+        """
+        # Records before count never change, so they can be read unlocked
+        count = len(self)
+        if cursor >= count:
+            return [], None
+
+        events = []
+        with open(self.log_path, 'rb') as log_file, open(self.index_path, 'rb') as index_file:
+            log_file.seek(self._read_index_entry(index_file, cursor // INDEX_INTERVAL))
+            position = cursor - cursor % INDEX_INTERVAL
+
+            end = min(cursor + limit, count)
+            while position < end:
+                timestamp, source, ids = self._read_record(log_file)
+                if position >= cursor:
+                    events.append({
+                        'cursor': position,
+                        'timestamp': timestamp,
+                        'source': SOURCES[source],
+                        'items': ids,
+                    })
+                position += 1
+
+        return events, (end if end < count else None)
+
+    def most_popular(self, limit=20):
+        """Return [(item_id, count), ...] for the most used items."""
+        with self._locked():
+            if self.popularity is None:
+                self.popularity = Counter()
+            # Count whatever was appended, by any process, since the last query
+            with open(self.log_path, 'rb') as log_file:
+                log_file.seek(self.popularity_offset)
+                while log_file.tell() < self.end_offset:
+                    _, _, ids = self._read_record(log_file)
+                    self.popularity.update(ids)
+            self.popularity_offset = self.end_offset
+            return self.popularity.most_common(limit)
@@ -4,6 +4,8 @@ const state = {
   selectedItems: {},
   maxCategories: 5,
   itemsData: null,
+  itemIds: null,
+  trims: {},
 };
 
 // OBS localStorage key
@@ -106,6 +108,10 @@ async function init() {
 
 // Load items data from JSON file
 async function loadItemsData() {
+  const itemIdsLoaded = loadItemIds();
+  // Not awaited: items rendered before it arrives just use their originals
+  loadTrims();
+
   try {
     const response = await fetch("items.json");
     if (!response.ok) {
@@ -116,6 +122,128 @@ async function loadItemsData() {
     console.error("Error loading items data:", error);
     state.itemsData = {};
   }
+
+  await itemIdsLoaded;
+}
+
+// Load the item id lookup table used to pack outfits
+async function loadItemIds() {
+  try {
+    const response = await fetch("item_ids.json");
+    if (!response.ok) {
+      throw new Error("Failed to load item ids");
+    }
+    const table = await response.json();
+    state.itemIds = {};
+    table.items.forEach(([id, category, filename]) => {
+      state.itemIds[`${category}/${filename}`] = id;
+    });
+  } catch (error) {
+    // Outfits are sent unpacked without the table
+    console.error("Error loading item ids:", error);
+    state.itemIds = null;
+  }
+}
+
+// Load the crop offsets of the trimmed image copies (see trim_images.py)
+async function loadTrims() {
+  try {
+    const response = await fetch("trims.json");
+    if (!response.ok) {
+      throw new Error("Failed to load trims");
+    }
+    state.trims = await response.json();
+  } catch (error) {
+    // Every item falls back to its padded original
+    console.error("Error loading trims:", error);
+    state.trims = {};
+  }
+}
+
+// Create the image for an item. Items with transparent padding load their
+// trimmed copy, placed at its original offset inside a frame with the
+// original canvas's aspect ratio, so it looks the same as the original.
+function createItemImage(category, itemFilename, className, alt) {
+  const originalSrc = `clothes/${category}/${itemFilename}`;
+  const trim = (state.trims[category] || {})[itemFilename];
+
+  const img = document.createElement("img");
+  img.alt = alt;
+
+  if (!trim) {
+    img.className = className;
+    img.src = originalSrc;
+    return img;
+  }
+
+  const box = document.createElement("div");
+  box.className = `${className} trimmed-box`;
+  box.style.setProperty("--w", trim.width);
+  box.style.setProperty("--h", trim.height);
+
+  const frame = document.createElement("div");
+  frame.className = "trimmed-frame";
+
+  img.src = `clothes_trimmed/${category}/${itemFilename}`;
+  img.style.left = `${(100 * trim.left) / trim.width}%`;
+  img.style.top = `${(100 * trim.top) / trim.height}%`;
+  img.style.width = `${(100 * trim.trimmed_width) / trim.width}%`;
+  img.style.height = `${(100 * trim.trimmed_height) / trim.height}%`;
+
+  // If the trimmed copy is missing, the original fills the same frame
+  img.onerror = () => {
+    img.onerror = null;
+    img.src = originalSrc;
+    img.style.left = img.style.top = "0";
+    img.style.width = img.style.height = "100%";
+  };
+
+  frame.appendChild(img);
+  box.appendChild(frame);
+  return box;
+}
+
+// Pack an outfit into a short string of item ids (see outfit_codec.py).
+// Returns null if any item has no id.
+function packOutfit(selectedItems) {
+  if (!state.itemIds) return null;
+
+  const ids = [];
+  for (const [category, itemData] of Object.entries(selectedItems)) {
+    const filenames = Array.isArray(itemData) ? itemData : [itemData];
+    for (const filename of filenames) {
+      const id = state.itemIds[`${category}/${filename}`];
+      if (id === undefined) return null;
+      if (!ids.includes(id)) ids.push(id);
+    }
+  }
+  if (ids.length === 0) return "";
+  ids.sort((a, b) => a - b);
+
+  // One width byte, then each id in `width` bits, zero-padded to a byte
+  const width = Math.max(...ids).toString(2).length;
+  const bytes = [width];
+  let current = 0;
+  let bitCount = 0;
+  for (const id of ids) {
+    for (let bit = width - 1; bit >= 0; bit--) {
+      current = (current << 1) | ((id >> bit) & 1);
+      bitCount++;
+      if (bitCount === 8) {
+        bytes.push(current);
+        current = 0;
+        bitCount = 0;
+      }
+    }
+  }
+  if (bitCount > 0) {
+    bytes.push(current << (8 - bitCount));
+  }
+
+  return btoa(String.fromCharCode(...bytes))
+    .replace(/\+/g, "-")
+    .replace(/\//g, "_")
+    .replace(/=+$/, "");
 }
 
 // Open category selection modal
@@ -252,11 +380,11 @@ function createItemCard(category, itemFilename) {
     itemCard.classList.add("selected");
   }
 
-  const itemImage = document.createElement("img");
-  itemImage.className = "item-image";
-  itemImage.src = `clothes/${category}/${itemFilename}`;
-  itemImage.alt = itemFilename;
-  itemImage.loading = "lazy";
+  itemCard.dataset.item = itemFilename;
+
+  const itemImage = createItemImage(category, itemFilename, "item-image", itemFilename);
+  const img = itemImage.tagName === "IMG" ? itemImage : itemImage.querySelector("img");
+  img.loading = "lazy";
 
   itemCard.appendChild(itemImage);
 
@@ -298,8 +426,7 @@ function selectItem(category, itemFilename) {
     if (categorySection) {
       const itemCards = categorySection.querySelectorAll(".item-card");
       itemCards.forEach((card) => {
-        const img = card.querySelector(".item-image");
-        if (img.src.endsWith(itemFilename)) {
+        if (card.dataset.item === itemFilename) {
           card.classList.toggle("selected");
         }
       });
@@ -319,8 +446,7 @@ function selectItem(category, itemFilename) {
     if (categorySection) {
       const itemCards = categorySection.querySelectorAll(".item-card");
       itemCards.forEach((card) => {
-        const img = card.querySelector(".item-image");
-        if (img.src.endsWith(itemFilename)) {
+        if (card.dataset.item === itemFilename) {
           card.classList.toggle("selected");
         } else {
           card.classList.remove("selected");
@@ -357,10 +483,7 @@ function updateOutfitPreview() {
           label.className = "outfit-item-label";
           label.textContent = category;
 
-          const img = document.createElement("img");
-          img.className = "outfit-item-image";
-          img.src = `clothes/${category}/${itemFilename}`;
-          img.alt = `${category} - ${itemFilename}`;
+          const img = createItemImage(category, itemFilename, "outfit-item-image", `${category} - ${itemFilename}`);
 
           outfitItem.appendChild(label);
           outfitItem.appendChild(img);
@@ -375,10 +498,7 @@ function updateOutfitPreview() {
         label.className = "outfit-item-label";
         label.textContent = category;
 
-        const img = document.createElement("img");
-        img.className = "outfit-item-image";
-        img.src = `clothes/${category}/${itemData}`;
-        img.alt = `${category} - ${itemData}`;
+        const img = createItemImage(category, itemData, "outfit-item-image", `${category} - ${itemData}`);
 
         outfitItem.appendChild(label);
         outfitItem.appendChild(img);
@@ -438,8 +558,7 @@ async function randomizeOutfit() {
         if (categorySection) {
           const itemCards = categorySection.querySelectorAll(".item-card");
           itemCards.forEach((card) => {
-            const img = card.querySelector(".item-image");
-            if (selectedItems.some(item => img.src.endsWith(item))) {
+            if (selectedItems.includes(card.dataset.item)) {
               card.classList.add("selected");
             }
           });
@@ -458,8 +577,7 @@ async function randomizeOutfit() {
         if (categorySection) {
           const itemCards = categorySection.querySelectorAll(".item-card");
           itemCards.forEach((card) => {
-            const img = card.querySelector(".item-image");
-            if (img.src.endsWith(randomItem)) {
+            if (card.dataset.item === randomItem) {
               card.classList.add("selected");
             }
           });
@@ -607,6 +725,7 @@ async function shareViaEmail() {
       },
       body: JSON.stringify({
         image: imageDataURL,
+        ...outfitPayload(state.selectedItems),
       }),
     });
 
@@ -700,6 +819,12 @@ function getApiUrl() {
     : "https://dressup-email-server-e49ebc6db462.herokuapp.com";
 }
 
+// Outfit request body: packed ids when possible, the full object otherwise
+function outfitPayload(selectedItems) {
+  const packed = packOutfit(selectedItems);
+  return packed !== null ? { packed } : { outfit: selectedItems };
+}
+
 // Send outfit to OBS overlay
 async function sendToOBS() {
   // Check if there are any selected items
@@ -720,9 +845,7 @@ async function sendToOBS() {
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({
-          outfit: state.selectedItems,
-        }),
+        body: JSON.stringify(outfitPayload(state.selectedItems)),
       });
 
       const result = await response.json();
@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
+import argparse
+import json
 import os
 import shutil
-from anthropic import Anthropic
+import time
 import base64
-from pathlib import Path
 
-# Initialize Anthropic client
-client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+from config import CLOTHES_DIR as _CLOTHES_DIR
 
 # Define paths
-CLOTHES_DIR = "/Users/hannahlyon/Documents/Projects/dress_up/clothes"
+CLOTHES_DIR = str(_CLOTHES_DIR)
 CATEGORIES = {
     "tops_dresses": "tops/dresses",
     "bottoms": "bottoms (pants, shorts, skirts)",
@@ -18,15 +18,37 @@ CATEGORIES = {
     "accessories": "accessories (jewelry, hats, scarves, belts, etc.)"
 }
 
-def classify_image(image_path):
-    """Classify a clothing item image using Claude."""
+MODEL = "claude-3-5-sonnet-20241022"
+PROMPT = "Classify this clothing item into ONE of these categories: tops_dresses, bottoms, shoes, bags, accessories. Respond with ONLY the category name, nothing else."
+
+# Bulk mode remembers its submitted batch here so an interrupted run can resume
+BATCH_STATE_FILE = os.path.join(CLOTHES_DIR, ".sort_batch.json")
+BATCH_POLL_SECONDS = 30
+
+# Message Batches API limits per batch (requests, and total request size),
+# with some headroom on the size for JSON framing
+MAX_BATCH_REQUESTS = 100_000
+MAX_BATCH_BYTES = 200 * 1024 * 1024
+
+_client = None
+
+def get_client():
+    """Create the Anthropic client on first use."""
+    global _client
+    if _client is None:
+        from anthropic import Anthropic
+        _client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    return _client
+
+def build_request_params(image_path):
+    """Build the messages.create parameters for classifying one image."""
     with open(image_path, "rb") as img_file:
         image_data = base64.standard_b64encode(img_file.read()).decode("utf-8")
 
-    message = client.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=100,
-        messages=[
+    return {
+        "model": MODEL,
+        "max_tokens": 100,
+        "messages": [
             {
                 "role": "user",
                 "content": [
@@ -40,21 +62,36 @@ def classify_image(image_path):
                     },
                     {
                         "type": "text",
-                        "text": "Classify this clothing item into ONE of these categories: tops_dresses, bottoms, shoes, bags, accessories. Respond with ONLY the category name, nothing else."
+                        "text": PROMPT
                     }
                 ],
             }
         ],
-    )
+    }
+
+def classify_image(image_path):
+    """Classify a clothing item image using Claude."""
+    message = get_client().messages.create(**build_request_params(image_path))
 
     category = message.content[0].text.strip().lower()
     return category
 
+def get_unsorted_files():
+    """Get all PNG files in the clothes directory (not in subdirectories)."""
+    return sorted(f for f in os.listdir(CLOTHES_DIR)
+                  if f.endswith('.png') and os.path.isfile(os.path.join(CLOTHES_DIR, f)))
+
+def move_to_category(filename, category):
+    """Move an unsorted image into its category folder."""
+    src_path = os.path.join(CLOTHES_DIR, filename)
+    dest_dir = os.path.join(CLOTHES_DIR, category)
+    # tops_dresses is a staging folder split up later by the categorize scripts
+    os.makedirs(dest_dir, exist_ok=True)
+    shutil.move(src_path, os.path.join(dest_dir, filename))
+
 def sort_clothes():
     """Sort all clothing items in the clothes directory."""
-    # Get all PNG files in the clothes directory (not in subdirectories)
-    png_files = [f for f in os.listdir(CLOTHES_DIR)
-                 if f.endswith('.png') and os.path.isfile(os.path.join(CLOTHES_DIR, f))]
+    png_files = get_unsorted_files()
 
     print(f"Found {len(png_files)} images to sort...")
 
@@ -71,10 +108,7 @@ def sort_clothes():
                 continue
 
             # Move to appropriate directory
-            dest_dir = os.path.join(CLOTHES_DIR, category)
-            dest_path = os.path.join(dest_dir, filename)
-
-            shutil.move(src_path, dest_path)
+            move_to_category(filename, category)
             print(f"[{i}/{len(png_files)}] {filename} → {category}")
 
         except Exception as e:
@@ -82,5 +116,136 @@ def sort_clothes():
 
     print("\nSorting complete!")
 
+def save_batch_state(state):
+    with open(BATCH_STATE_FILE, "w") as f:
+        json.dump(state, f, indent=2)
+
+def load_batch_state():
+    with open(BATCH_STATE_FILE) as f:
+        return json.load(f)
+
+def submit_batches(png_files):
+    """Submit the images as message batches within the API limits, saving each id.
+
+    The state file is rewritten after every submission, so an interrupted
+    run still knows about the batches that went through. Images that were
+    never submitted stay in clothes/ for the next run.
+    """
+    state = {"batches": []}
+
+    def submit(files, requests):
+        batch = get_client().messages.batches.create(requests=requests)
+        state["batches"].append({"batch_id": batch.id, "files": files})
+        save_batch_state(state)
+        print(f"Submitted batch {batch.id} with {len(files)} images")
+
+    # custom_ids only allow [a-zA-Z0-9_-], so map them back to filenames
+    files, requests, batch_bytes = {}, [], 0
+    for i, filename in enumerate(png_files):
+        request = {"custom_id": f"img-{i}", "params": build_request_params(os.path.join(CLOTHES_DIR, filename))}
+        request_bytes = len(json.dumps(request))
+        if requests and (len(requests) >= MAX_BATCH_REQUESTS or batch_bytes + request_bytes > MAX_BATCH_BYTES):
+            submit(files, requests)
+            files, requests, batch_bytes = {}, [], 0
+
+        files[request["custom_id"]] = filename
+        requests.append(request)
+        batch_bytes += request_bytes
+
+    if requests:
+        submit(files, requests)
+    return state
+
+def wait_for_batch(batch_id, poll_seconds=BATCH_POLL_SECONDS):
+    """Poll until the batch has finished processing."""
+    while True:
+        batch = get_client().messages.batches.retrieve(batch_id)
+        if batch.processing_status == "ended":
+            return batch
+        print(f"Batch {batch_id} still processing ({batch.request_counts.processing} remaining)...")
+        time.sleep(poll_seconds)
+
+def apply_batch_results(batch_state):
+    """Move every classified image in a single pass over one batch's results."""
+    files = batch_state["files"]
+    moved = skipped = 0
+
+    for entry in get_client().messages.batches.results(batch_state["batch_id"]):
+        filename = files.get(entry.custom_id)
+        if filename is None:
+            continue
+
+        if entry.result.type != "succeeded":
+            print(f"{filename}: request {entry.result.type}, skipping...")
+            skipped += 1
+            continue
+
+        category = entry.result.message.content[0].text.strip().lower()
+        if category not in CATEGORIES:
+            print(f"{filename}: Unknown category '{category}', skipping...")
+            skipped += 1
+            continue
+
+        if not os.path.isfile(os.path.join(CLOTHES_DIR, filename)):
+            # Already moved by an earlier, interrupted run
+            skipped += 1
+            continue
+
+        try:
+            move_to_category(filename, category)
+            print(f"{filename} → {category}")
+            moved += 1
+        except Exception as e:
+            print(f"Error moving {filename}: {e}")
+            skipped += 1
+
+    return moved, skipped
+
+def sort_clothes_bulk(poll_seconds=BATCH_POLL_SECONDS):
+    """Sort all unsorted images with message batches instead of one call each."""
+    if os.path.exists(BATCH_STATE_FILE):
+        state = load_batch_state()
+        images = sum(len(batch["files"]) for batch in state["batches"])
+        print(f"Resuming {len(state['batches'])} batches with {images} images")
+    else:
+        png_files = get_unsorted_files()
+        print(f"Found {len(png_files)} images to sort...")
+        if not png_files:
+            return
+        state = submit_batches(png_files)
+
+    moved = skipped = 0
+    for batch in state["batches"]:
+        wait_for_batch(batch["batch_id"], poll_seconds)
+        batch_moved, batch_skipped = apply_batch_results(batch)
+        moved += batch_moved
+        skipped += batch_skipped
+
+    # The batches have been applied; the next run should start new ones
+    os.remove(BATCH_STATE_FILE)
+
+    print(f"\nSorting complete! Moved {moved}, skipped {skipped}.")
+
+def main(argv=None):
+    global _client
+
+    parser = argparse.ArgumentParser(description="Sort unsorted clothing images into categories using Claude")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Submit the images as message batches and apply the results when they finish")
+    parser.add_argument("--local", action="store_true",
+                        help="Use the local stand-in API instead of Anthropic (for trying things out)")
+    parser.add_argument("--poll-seconds", type=float, default=BATCH_POLL_SECONDS,
+                        help="Seconds between batch status checks in bulk mode")
+    args = parser.parse_args(argv)
+
+    if args.local:
+        from local_anthropic import LocalAnthropic
+        _client = LocalAnthropic()
+
+    if args.bulk:
+        sort_clothes_bulk(args.poll_seconds)
+    else:
+        sort_clothes()
+
 if __name__ == "__main__":
-    sort_clothes()
+    main()
@@ -0,0 +1,79 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from outfit_history import OutfitHistory
+
+
+def history_files(tmp_path):
+    return tmp_path / 'history.log', tmp_path / 'history.idx'
+
+
+def test_two_instances_share_the_log(tmp_path):
+    # Two server processes opening the same files, appending in turn
+    first = OutfitHistory(*history_files(tmp_path))
+    second = OutfitHistory(*history_files(tmp_path))
+    for i in range(100):
+        first.append([1000 + i], 'obs')
+        second.append([2000 + i], 'send-outfit')
+
+    assert len(first) == len(second) == 200
+
+    events, next_cursor = first.read(64, 3)
+    assert [event['items'] for event in events] == [[1032], [2032], [1033]]
+    assert [event['cursor'] for event in events] == [64, 65, 66]
+    assert next_cursor == 67
+
+    # A restart rebuilds the same view from the files
+    reopened = OutfitHistory(*history_files(tmp_path))
+    assert len(reopened) == 200
+    assert reopened.read(198, 5) == second.read(198, 5)
+    assert reopened.read(198, 5)[1] is None
+
+
+def test_popularity_includes_other_instances(tmp_path):
+    first = OutfitHistory(*history_files(tmp_path))
+    second = OutfitHistory(*history_files(tmp_path))
+    first.append([1, 2], 'obs')
+    assert first.most_popular() == [(1, 1), (2, 1)]
+
+    second.append([2, 3], 'obs')
+    assert first.most_popular(1) == [(2, 2)]
+
+
+def append_from_process(paths, base, total):
+    history = OutfitHistory(*paths)
+    for i in range(total):
+        history.append([base + i], 'obs')
+
+
+def test_concurrent_processes_keep_the_index_consistent(tmp_path):
+    paths = history_files(tmp_path)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        list(executor.map(append_from_process, [paths, paths], [1000, 2000], [150, 150]))
+
+    history = OutfitHistory(*paths)
+    assert len(history) == 300
+
+    events, _ = history.read(0, 100)
+    events += history.read(100, 100)[0] + history.read(200, 100)[0]
+    assert [event['cursor'] for event in events] == list(range(300))
+    items = sorted(event['items'][0] for event in events)
+    assert items == list(range(1000, 1150)) + list(range(2000, 2150))
+
+    # Every page start found through the index matches a sequential read
+    for cursor in (64, 128, 191, 256):
+        assert history.read(cursor, 1)[0] == [events[cursor]]
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    history = OutfitHistory(*history_files(tmp_path))
+    for i in range(70):
+        history.append([i + 1], 'obs')
+
+    log_path, _ = history_files(tmp_path)
+    with open(log_path, 'ab') as f:
+        f.write(b'\x01\x02\x03\x04\x00\x05\x01')
+
+    reopened = OutfitHistory(*history_files(tmp_path))
+    assert len(reopened) == 70
+    assert reopened.append([99], 'obs') == 70
+    assert reopened.read(70, 5)[0][0]['items'] == [99]
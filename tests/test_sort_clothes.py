@@ -0,0 +1,98 @@
+import importlib
+import json
+import os
+
+import pytest
+
+import config
+import local_anthropic
+from local_anthropic import LocalAnthropic
+
+
+@pytest.fixture
+def sorter(tmp_path, monkeypatch):
+    """sort_clothes loaded against a temporary clothes folder."""
+    clothes_dir = tmp_path / "clothes"
+    clothes_dir.mkdir()
+    for i in range(12):
+        (clothes_dir / f"item{i}.png").write_bytes(f"image {i}".encode())
+
+    monkeypatch.setenv("DRESSUP_CLOTHES_DIR", str(clothes_dir))
+    importlib.reload(config)
+    sort_clothes = importlib.reload(importlib.import_module("sort_clothes"))
+    yield sort_clothes
+
+    monkeypatch.delenv("DRESSUP_CLOTHES_DIR")
+    importlib.reload(config)
+    importlib.reload(sort_clothes)
+
+
+def use_local_client(sorter, tmp_path, processing_seconds):
+    sorter._client = LocalAnthropic(tmp_path / "batches.json", processing_seconds=processing_seconds)
+
+
+def interrupt_on_poll(seconds):
+    raise KeyboardInterrupt
+
+
+def sorted_categories(sorter):
+    """Map each moved filename to the category folder it ended up in."""
+    return {
+        filename: category
+        for category in sorter.CATEGORIES
+        if os.path.isdir(os.path.join(sorter.CLOTHES_DIR, category))
+        for filename in os.listdir(os.path.join(sorter.CLOTHES_DIR, category))
+    }
+
+
+def test_bulk_sort_resumes_after_interrupt(sorter, tmp_path, monkeypatch):
+    expected = {
+        filename: local_anthropic.classify(sorter.build_request_params(os.path.join(sorter.CLOTHES_DIR, filename)))
+        for filename in sorter.get_unsorted_files()
+    }
+
+    # Batches never finish, so the first poll is interrupted like Ctrl+C
+    use_local_client(sorter, tmp_path, processing_seconds=3600)
+    monkeypatch.setattr(sorter.time, "sleep", interrupt_on_poll)
+    with pytest.raises(KeyboardInterrupt):
+        sorter.sort_clothes_bulk(poll_seconds=0)
+
+    assert os.path.exists(sorter.BATCH_STATE_FILE)
+    submitted = sorter.load_batch_state()
+    assert len(sorter.get_unsorted_files()) == 12
+
+    # The rerun picks the saved batches back up instead of submitting new ones
+    use_local_client(sorter, tmp_path, processing_seconds=0)
+    monkeypatch.setattr(sorter, "submit_batches", None)
+    sorter.sort_clothes_bulk(poll_seconds=0)
+
+    assert not os.path.exists(sorter.BATCH_STATE_FILE)
+    assert sorter.get_unsorted_files() == []
+    assert sorted_categories(sorter) == expected
+    assert sum(len(batch["files"]) for batch in submitted["batches"]) == 12
+
+
+def test_bulk_sort_splits_batches_at_the_request_limit(sorter, tmp_path, monkeypatch):
+    use_local_client(sorter, tmp_path, processing_seconds=0)
+    monkeypatch.setattr(sorter, "MAX_BATCH_REQUESTS", 5)
+
+    state = sorter.submit_batches(sorter.get_unsorted_files())
+
+    assert [len(batch["files"]) for batch in state["batches"]] == [5, 5, 2]
+    with open(sorter.BATCH_STATE_FILE) as f:
+        saved = json.load(f)
+    assert [batch["batch_id"] for batch in saved["batches"]] == [batch["batch_id"] for batch in state["batches"]]
+
+
+def test_bulk_sort_splits_batches_at_the_size_limit(sorter, tmp_path, monkeypatch):
+    use_local_client(sorter, tmp_path, processing_seconds=0)
+    request_bytes = len(json.dumps({
+        "custom_id": "img-0",
+        "params": sorter.build_request_params(os.path.join(sorter.CLOTHES_DIR, "item0.png")),
+    }))
+    monkeypatch.setattr(sorter, "MAX_BATCH_BYTES", request_bytes * 4)
+
+    state = sorter.submit_batches(sorter.get_unsorted_files())
+
+    assert all(len(batch["files"]) <= 4 for batch in state["batches"])
+    assert sum(len(batch["files"]) for batch in state["batches"]) == 12
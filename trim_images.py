@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Trim transparent padding off the clothing PNGs.
+
+For every image under clothes/ the alpha channel is scanned with NumPy
+to find the tight bounding box of visible pixels. If cropping to it
+gives a smaller file, the cropped copy is written to
+clothes_trimmed/<category>/ and its offsets and original size are
+published in trims.json, so script.js and obs.js can draw it exactly
+where the padded original sat:
+
+    {
+      "tops": {
+        "<filename>.png": {
+          "width": 300, "height": 188,      # original canvas
+          "left": 12, "top": 4,             # offset of the trimmed copy
+          "trimmed_width": 270, "trimmed_height": 180
+        }
+      }
+    }
+
+Only trimmed images appear there, since the site downloads it on every
+page load; everything else keeps using the original.
+
+Runs incrementally: content hashes of the source images are kept in
+.trim_cache.json (keyed by path inside clothes/, like optimize_images.py,
+so it survives a fresh clone) and unchanged images are skipped. trims.json
+is rebuilt from the cache on every run.
+
+Requires Pillow and NumPy:
+    pip3 install Pillow numpy
+
+Usage:
+    python3 trim_images.py
+    python3 trim_images.py --alpha-threshold 4
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+
+from config import CLOTHES_DIR, TRIMMED_DIR, TRIMS_FILE as MANIFEST_FILE, TRIM_CACHE_FILE as CACHE_FILE
+
+# Pixels with alpha at or below this count as padding. 0 keeps every
+# visible pixel; raising it also trims faint anti-aliasing haze.
+ALPHA_THRESHOLD = 0
+
+
+def find_bounding_box(img, alpha_threshold=ALPHA_THRESHOLD):
+    """Return (left, top, right, bottom) of the non-transparent pixels.
+
+    Returns None for a fully transparent image.
+    """
+    import numpy as np
+
+    visible = np.asarray(img.getchannel('A')) > alpha_threshold
+    rows = np.flatnonzero(visible.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(visible.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def trim_image(src_bytes, dest_path, alpha_threshold=ALPHA_THRESHOLD):
+    """Write a trimmed copy of an image if that makes it smaller.
+
+    Returns the trims.json entry for the copy, or None when the image has
+    no padding or the cropped PNG would not be smaller than the source
+    (any earlier copy is then removed).
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(src_bytes)) as img:
+        rgba = img.convert('RGBA')
+
+    width, height = rgba.size
+    box = find_bounding_box(rgba, alpha_threshold) or (0, 0, width, height)
+    left, top, right, bottom = box
+
+    trimmed_bytes = None
+    if box != (0, 0, width, height):
+        buffer = io.BytesIO()
+        rgba.crop(box).save(buffer, format='PNG', optimize=True)
+        trimmed_bytes = buffer.getvalue()
+
+    if trimmed_bytes is None or len(trimmed_bytes) >= len(src_bytes):
+        if dest_path.exists():
+            os.remove(dest_path)
+        return None
+
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    dest_path.write_bytes(trimmed_bytes)
+    return {
+        'width': width,
+        'height': height,
+        'left': left,
+        'top': top,
+        'trimmed_width': right - left,
+        'trimmed_height': bottom - top,
+    }
+
+
+def is_up_to_date(cached, src_hash, dest_path, alpha_threshold):
+    """Check whether a cache entry still matches its source image."""
+    if cached is None or (cached['trim'] is not None and not dest_path.exists()):
+        return False
+    return cached['hash'] == src_hash and cached['alpha_threshold'] == alpha_threshold
+
+
+def load_cache():
+    """Load {category/filename: {'hash', 'alpha_threshold', 'trim'}}."""
+    if CACHE_FILE.exists():
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache):
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def save_manifest(cache):
+    """Publish the trimmed entries from the cache as trims.json."""
+    manifest = {}
+    for key, cached in cache.items():
+        if cached['trim'] is not None:
+            category, filename = key.split('/', 1)
+            manifest.setdefault(category, {})[filename] = cached['trim']
+
+    with open(MANIFEST_FILE, 'w') as f:
+        # Compact, since the site downloads it on every page load
+        json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+
+
+def trim_images(alpha_threshold=ALPHA_THRESHOLD):
+    """Trim every new or changed PNG and update the manifest."""
+    cache = load_cache()
+    counts = {'trimmed': 0, 'kept': 0, 'unchanged': 0, 'removed': 0, 'errors': 0}
+    bytes_before = bytes_after = 0
+
+    categories = sorted(p.name for p in CLOTHES_DIR.iterdir() if p.is_dir())
+    present = set()
+
+    for category in categories:
+        for src_path in sorted((CLOTHES_DIR / category).glob('*.png')):
+            key = f'{category}/{src_path.name}'
+            dest_path = TRIMMED_DIR / category / src_path.name
+            present.add(key)
+
+            src_bytes = src_path.read_bytes()
+            src_hash = hashlib.sha256(src_bytes).hexdigest()
+            if is_up_to_date(cache.get(key), src_hash, dest_path, alpha_threshold):
+                counts['unchanged'] += 1
+                continue
+
+            try:
+                trim = trim_image(src_bytes, dest_path, alpha_threshold)
+            except Exception as e:
+                print(f"Error trimming {src_path}: {e}")
+                counts['errors'] += 1
+                continue
+
+            cache[key] = {'hash': src_hash, 'alpha_threshold': alpha_threshold, 'trim': trim}
+            if trim is None:
+                counts['kept'] += 1
+            else:
+                counts['trimmed'] += 1
+                bytes_before += len(src_bytes)
+                bytes_after += dest_path.stat().st_size
+
+    # Drop entries (and trimmed copies) for images that were removed
+    for key in set(cache) - present:
+        del cache[key]
+        stale_copy = TRIMMED_DIR / key
+        if stale_copy.exists():
+            os.remove(stale_copy)
+        counts['removed'] += 1
+
+    # Categories whose folder is gone lose their trimmed copies too
+    if TRIMMED_DIR.exists():
+        for path in TRIMMED_DIR.iterdir():
+            if path.is_dir() and path.name not in categories:
+                shutil.rmtree(path, ignore_errors=True)
+
+    save_cache(cache)
+    save_manifest(cache)
+
+    print(f"Trimmed: {counts['trimmed']}")
+    print(f"Kept original (no padding, or no smaller when cropped): {counts['kept']}")
+    print(f"Unchanged: {counts['unchanged']}")
+    print(f"Removed: {counts['removed']}")
+    if counts['errors']:
+        print(f"Errors: {counts['errors']}")
+    if bytes_before:
+        saved = bytes_before - bytes_after
+        print(f"Bytes saved on trimmed images: {saved:,} ({100 * saved / bytes_before:.1f}%)")
+    print(f"\nManifest written to {MANIFEST_FILE}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Trim transparent padding off the clothing PNGs')
+    parser.add_argument('--alpha-threshold', type=int, default=ALPHA_THRESHOLD,
+                        help='Treat pixels with alpha at or below this as padding (default: 0)')
+    args = parser.parse_args(argv)
+
+    trim_images(alpha_threshold=args.alpha_threshold)
+
+
+if __name__ == '__main__':
+    main()